@@ -0,0 +1,5 @@
+"""Shared benchmark engine for the encryption report.
+
+Run ``python -m benchmark --help`` from the repository root for the
+available benchmark modes.
+"""
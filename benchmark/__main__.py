@@ -0,0 +1,398 @@
+"""Command-line entry point: ``python -m benchmark <mode> [options]``."""
+
+import argparse
+import os
+import tempfile
+
+from benchmark.cache import CACHE_DIR, CellCache
+from benchmark.ciphers import BACKENDS, CIPHERS, DEFAULT_BACKEND, cipher_names, get_cipher, resolve_backends
+from benchmark.container import CONTAINER_ALGORITHMS, CONTAINER_CHUNK_SIZE, run_container, save_container
+from benchmark.engine import (DATAFRAMES_DIR, FILE_SIZES, MODES, run_benchmark, save_throughputs, save_to_csv,
+                              test_file_path)
+from benchmark.handshake import CURVES, run_handshakes
+from benchmark.host import host_fingerprint, report_fingerprint
+from benchmark.inputs import MappedInput
+from benchmark.memory import profile_memory, save_memory_profile
+from benchmark.parallel import measure_thread_scaling
+from benchmark.pipeline import FILE_CIPHERS, QUEUE_DEPTH, run_file_pipeline, save_file_pipeline
+from benchmark.regression import (DEFAULT_ALPHA, DEFAULT_THRESHOLD, SUITE_DIR, compare_runs, print_comparison,
+                                  resolve_run, run_suite, save_baseline, save_comparison, suite_rows)
+from benchmark.results import RESULTS_DIR, ResultsStore, new_run_id, result_rows
+from benchmark.scheduler import run_aggregate, run_parallel
+from benchmark.service import (CIPHER_NAMES, EXECUTORS, PAYLOAD_SIZES, REQUEST_TIMEOUT, TRANSPORTS, run_service,
+                               save_service, serve)
+from benchmark.small_messages import (CALLS_PER_SAMPLE, MESSAGE_SIZES, SMALL_MESSAGE_CALLS, run_small_messages,
+                                      save_small_messages)
+from benchmark.streaming import DEFAULT_CHUNK_SIZE
+from benchmark.sweep import SWEEP_CIPHERS, SWEEP_MODES, SWEEP_SIZES, ensure_sweep_files, run_sweep, save_sweep
+from benchmark.timing import TimingConfig
+
+
+def throughput_command(args):
+    ciphers = resolve_backends(args.ciphers, args.backend, args.mode)
+    cache = None if args.no_cache else CellCache(args.cache)
+    if args.workers:
+        results = run_parallel(ciphers, args.file_sizes, timing_from_args(args), args.mode, args.chunk_size,
+                               args.workers, args.pin, cache=cache)
+    else:
+        results = run_benchmark(ciphers, args.file_sizes, timing_from_args(args), args.mode, args.chunk_size,
+                                cache=cache)
+    if not args.no_save:
+        ResultsStore(args.store).append(result_rows(results, args.file_sizes, args.mode,
+                                                            fingerprint=args.fingerprint))
+    if args.csv:
+        save_throughputs(results, args.file_sizes, args.output_dir)
+    if args.profile_memory:
+        memory_command(args)
+
+
+def memory_command(args):
+    results = profile_memory(resolve_backends(args.ciphers, args.backend, args.mode), args.file_sizes, args.mode,
+                             args.chunk_size)
+    if not args.no_save:
+        save_memory_profile(results, args.file_sizes, args.mode, args.output_dir)
+
+
+def aggregate_command(args):
+    result = run_aggregate(args.cipher, args.key_size, args.file_size, args.workers, args.iterations,
+                           args.mode, args.chunk_size, args.pin)
+    label = get_cipher(args.cipher).row_label(args.key_size, "Encryption")
+    print(f"File: test_{args.file_size}MB.txt, {label}, {result['workers']} workers: "
+          f"System Encryption Throughput: {result['encrypt']:.2f} MB/s, "
+          f"System Decryption Throughput: {result['decrypt']:.2f} MB/s")
+    print("Per-Worker Encryption Throughput: "
+          + ", ".join(f"{throughput:.2f}" for throughput in result["per_worker_encrypt"]) + " MB/s")
+    print(f"Wall Time: {result['wall_time']:.2f} seconds")
+
+
+def threads_command(args):
+    thread_counts = args.threads or default_thread_counts()
+    with MappedInput(test_file_path(args.file_size)) as mapped:
+        results = measure_thread_scaling(mapped.view, thread_counts, timing_from_args(args))
+
+    rows = [["Operation", "Baseline"] + [f"{threads} Threads" for threads in thread_counts]]
+    for name, throughputs in results.items():
+        rows.append([name, throughputs["baseline"]] + [throughputs[threads] for threads in thread_counts])
+        print(f"{name}: Baseline {throughputs['baseline']:.2f} MB/s, "
+              + ", ".join(f"{threads} Threads {throughputs[threads]:.2f} MB/s" for threads in thread_counts))
+    if not args.no_save:
+        save_to_csv(args.output or os.path.join(DATAFRAMES_DIR, 'throughput', 'thread_scaling_throughputs.csv'),
+                    rows)
+
+
+def default_thread_counts():
+    """Powers of two up to the core count, plus the core count itself."""
+    cores = os.cpu_count() or 1
+    counts = [1 << power for power in range(cores.bit_length()) if 1 << power <= cores]
+    return counts if counts[-1] == cores else counts + [cores]
+
+
+def handshake_command(args):
+    results = run_handshakes(args.curves, args.count, args.workers, args.pin)
+    rows = [["Curve", "Handshakes/s", "p50 (ms)", "p99 (ms)", "Workers"]]
+    for curve_name, result in results.items():
+        rows.append([curve_name, result["ops"], result["p50"], result["p99"], result["workers"]])
+    if not args.no_save:
+        save_to_csv(args.output or os.path.join(DATAFRAMES_DIR, 'throughput', 'handshake_throughputs.csv'), rows)
+
+
+def messages_command(args):
+    results = run_small_messages(args.ciphers, args.sizes, args.key_size, args.count, timing_from_args(args))
+    if not args.no_save:
+        save_small_messages(results, args.key_size, args.output)
+
+
+def pipeline_command(args):
+    results = run_file_pipeline(args.ciphers, args.file_sizes, args.directory, args.key_size, args.chunk_size,
+                                args.depth, timing_from_args(args), not args.no_fsync, args.cold)
+    if not args.no_save:
+        save_file_pipeline(results, args.key_size, args.output)
+
+
+def service_command(args):
+    results = run_service(args.ciphers, args.sizes, args.rate, args.duration, args.connections, args.executor,
+                          args.workers, args.transport, args.timeout)
+    if not args.no_save:
+        save_service(results, args.rate, args.executor, args.output)
+
+
+def serve_command(args):
+    serve(args.executor, args.workers, args.host, args.port, args.unix)
+
+
+def add_executor_arguments(parser):
+    parser.add_argument("--executor", choices=EXECUTORS, default="thread",
+                        help="Where the server runs cipher calls: a thread pool, a process pool or the event loop")
+    parser.add_argument("--workers", type=int, help="Executor pool size (default: the executor's own default)")
+
+
+def container_command(args):
+    results = run_container(args.algorithms, args.file_sizes, args.range_sizes, args.key_size, args.reads,
+                            args.chunk_size, args.directory)
+    if not args.no_save:
+        save_container(results, args.key_size, args.output)
+
+
+def sweep_command(args):
+    file_sizes = ensure_sweep_files(args.file_sizes, args.generate, args.seed)
+    results = run_sweep(args.ciphers, file_sizes, args.modes, args.key_size, args.chunk_size, args.iterations,
+                        args.cold)
+    if not args.no_save:
+        store = ResultsStore(args.store)
+        run_id = new_run_id()
+        for mode, cells in results.items():
+            store.append(result_rows(cells, file_sizes, f"sweep-{mode}", run_id, args.fingerprint))
+        save_sweep(results, file_sizes, args.output)
+
+
+def suite_command(args):
+    run_id = new_run_id()
+    ResultsStore(args.store).append(suite_rows(run_suite(), run_id, args.fingerprint))
+    print(f"Saved suite run {run_id}")
+    if args.name:
+        save_baseline(args.name, run_id, args.store)
+
+
+def compare_command(args):
+    store = ResultsStore(args.store)
+    try:
+        baseline_run, candidate_run = resolve_run(store, args.baseline), resolve_run(store, args.candidate)
+    except ValueError as error:
+        raise SystemExit(str(error))
+    rows, changes = compare_runs(store, baseline_run, candidate_run, args.threshold, args.alpha)
+    print_comparison(rows, changes, baseline_run, candidate_run)
+    if args.output:
+        save_comparison(rows, args.output)
+    regressions = sum(row["status"] == "regression" for row in rows)
+    if regressions:
+        print(f"{regressions} regressions beyond {args.threshold:.0%} at p < {args.alpha}")
+        raise SystemExit(1)
+
+
+def add_timing_arguments(parser, max_iterations, target_rse=0.01):
+    parser.add_argument("--iterations", type=int, default=max_iterations, help="Maximum timed iterations per cell")
+    parser.add_argument("--min-iterations", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed iterations before sampling")
+    parser.add_argument("--target-rse", type=float, default=target_rse,
+                        help="Stop sampling once the relative standard error is below this (0 runs every iteration)")
+    parser.add_argument("--outlier-threshold", type=float, default=TimingConfig.outlier_threshold,
+                        help="Drop iterations whose modified z-score exceeds this (0 keeps every iteration)")
+
+
+def timing_from_args(args):
+    return TimingConfig(args.warmup, min(args.min_iterations, args.iterations), args.iterations, args.target_rse,
+                        args.outlier_threshold)
+
+
+def add_input_arguments(parser):
+    parser.add_argument("--mode", choices=MODES, default="read",
+                        help="How inputs are prepared: read whole file, mmap, stream in chunks, "
+                             "or zero-copy into preallocated buffers (not available for rc4)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Chunk size in bytes for --mode stream")
+
+
+def add_cipher_arguments(parser):
+    parser.add_argument("--ciphers", nargs="+", choices=cipher_names(),
+                        help="Default: every cipher that supports the chosen --mode")
+    parser.add_argument("--backend", nargs="+", default=[DEFAULT_BACKEND], choices=BACKENDS,
+                        help="Libraries to run each cipher with; give both to compare them "
+                             "(ciphers a backend lacks in the chosen --mode are skipped)")
+
+
+def select_ciphers(parser, args):
+    """Default --ciphers to the ciphers the --mode supports and reject explicit ones that do not."""
+    if args.ciphers is None:
+        args.ciphers = [name for name in cipher_names() if get_cipher(name).supports_mode(args.mode)]
+    elif DEFAULT_BACKEND in args.backend:
+        unsupported = [name for name in args.ciphers if not get_cipher(name).supports_mode(args.mode)]
+        if unsupported:
+            parser.error(f"No {args.mode} implementation for {', '.join(unsupported)}")
+
+
+def add_pool_arguments(parser):
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per available core)")
+    parser.add_argument("--pin", action="store_true",
+                        help="Pin each worker to its own core, capping workers at the core count")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    throughput = subparsers.add_parser("throughput", help="Bulk encrypt/decrypt throughput over test_files")
+    add_cipher_arguments(throughput)
+    throughput.add_argument("--file-sizes", nargs="+", type=int, default=FILE_SIZES, help="File sizes in MB")
+    add_timing_arguments(throughput, 100)
+    add_input_arguments(throughput)
+    add_pool_arguments(throughput)
+    throughput.add_argument("--store", default=RESULTS_DIR, help="Results store directory (default: %(default)s)")
+    throughput.add_argument("--no-save", action="store_true", help="Do not append samples to the results store")
+    throughput.add_argument("--cache", default=CACHE_DIR,
+                            help="Checkpoint directory for finished cells; reruns skip cached cells "
+                                 "(default: %(default)s)")
+    throughput.add_argument("--no-cache", action="store_true", help="Recompute every cell and do not checkpoint")
+    throughput.add_argument("--csv", action="store_true", help="Also write the legacy wide per-family CSVs")
+    throughput.add_argument("--output-dir", help="Directory for --csv and memory profile output "
+                                                 "(default: dataframes/throughput)")
+    throughput.add_argument("--profile-memory", action="store_true",
+                            help="Follow the timed runs with an untimed memory profiling pass")
+    throughput.set_defaults(func=throughput_command)
+
+    memory = subparsers.add_parser("memory", help="Untimed peak heap/RSS profiling pass over test_files")
+    add_cipher_arguments(memory)
+    memory.add_argument("--file-sizes", nargs="+", type=int, default=FILE_SIZES, help="File sizes in MB")
+    add_input_arguments(memory)
+    memory.add_argument("--output-dir", help="Defaults to dataframes/throughput")
+    memory.add_argument("--no-save", action="store_true", help="Print results without writing a CSV")
+    memory.set_defaults(func=memory_command)
+
+    messages = subparsers.add_parser("messages", help="Per-message latency of small records, split into "
+                                                      "construction, IV/nonce and padding overheads")
+    messages.add_argument("--ciphers", nargs="+", default=list(SMALL_MESSAGE_CALLS), choices=list(SMALL_MESSAGE_CALLS))
+    messages.add_argument("--sizes", nargs="+", type=int, default=MESSAGE_SIZES, help="Message sizes in bytes")
+    messages.add_argument("--key-size", type=int, default=32, help="Key size in bytes")
+    messages.add_argument("--count", type=int, default=CALLS_PER_SAMPLE, help="Back-to-back calls per timed sample")
+    add_timing_arguments(messages, 30, target_rse=0.02)
+    messages.add_argument("--output", help="Defaults to dataframes/throughput/small_message_latencies.csv")
+    messages.add_argument("--no-save", action="store_true", help="Print results without writing a CSV")
+    messages.set_defaults(func=messages_command)
+
+    pipeline = subparsers.add_parser("pipeline", help="File-to-file encryption with overlapped read, encrypt and "
+                                                      "write stages, end-to-end against cipher-only MB/s")
+    pipeline.add_argument("--ciphers", nargs="+", default=list(FILE_CIPHERS), choices=list(FILE_CIPHERS))
+    pipeline.add_argument("--file-sizes", nargs="+", type=int, default=FILE_SIZES, help="File sizes in MB")
+    pipeline.add_argument("--key-size", type=int, default=32, help="Key size in bytes")
+    pipeline.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                          help="Bytes per pipeline buffer, a multiple of 16")
+    pipeline.add_argument("--depth", type=int, default=QUEUE_DEPTH, help="Reusable buffers per queue")
+    pipeline.add_argument("--directory", default=tempfile.gettempdir(),
+                          help="Where encrypted and decrypted copies are written, then removed (default: %(default)s)")
+    pipeline.add_argument("--no-fsync", action="store_true",
+                          help="Do not fsync outputs, so writes may only reach the page cache")
+    pipeline.add_argument("--cold", action="store_true",
+                          help="Evict inputs from the page cache before every run so reads hit the disk")
+    add_timing_arguments(pipeline, 10, target_rse=0.02)
+    pipeline.add_argument("--output", help="Defaults to dataframes/throughput/file_pipeline_throughputs.csv")
+    pipeline.add_argument("--no-save", action="store_true", help="Print results without writing a CSV")
+    pipeline.set_defaults(func=pipeline_command)
+
+    service = subparsers.add_parser("service", help="asyncio encryption server on localhost driven at a fixed "
+                                                    "request rate: throughput, latency and queueing delay")
+    service.add_argument("--ciphers", nargs="+", default=CIPHER_NAMES, choices=CIPHER_NAMES)
+    service.add_argument("--sizes", nargs="+", type=int, default=PAYLOAD_SIZES, help="Payload sizes in bytes")
+    service.add_argument("--rate", type=float, default=500, help="Offered load in requests per second")
+    service.add_argument("--duration", type=float, default=5, help="Seconds of load per cipher and payload size")
+    service.add_argument("--connections", type=int, default=8, help="Pipelined client connections")
+    service.add_argument("--transport", choices=TRANSPORTS, default="tcp")
+    service.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT,
+                         help="Seconds after its scheduled send time before a request counts as timed out")
+    add_executor_arguments(service)
+    service.add_argument("--output", help="Defaults to dataframes/throughput/service_latencies.csv")
+    service.add_argument("--no-save", action="store_true", help="Print results without writing a CSV")
+    service.set_defaults(func=service_command)
+
+    server = subparsers.add_parser("serve", help="Run the encryption server alone until interrupted")
+    server.add_argument("--host", default="127.0.0.1")
+    server.add_argument("--port", type=int, default=0, help="TCP port (default: any free port)")
+    server.add_argument("--unix", help="Listen on this Unix socket path instead of TCP")
+    add_executor_arguments(server)
+    server.set_defaults(func=serve_command)
+
+    container = subparsers.add_parser("container", help="Random-access range reads from the chunked container "
+                                                        "format against decrypting the whole payload")
+    container.add_argument("--algorithms", nargs="+", default=list(CONTAINER_ALGORITHMS),
+                           choices=list(CONTAINER_ALGORITHMS))
+    container.add_argument("--file-sizes", nargs="+", type=int, default=[1000], help="File sizes in MB")
+    container.add_argument("--range-sizes", nargs="+", type=int, default=[4096, 65536, 1024 * 1024],
+                           help="Plaintext bytes per range read")
+    container.add_argument("--reads", type=int, default=200, help="Random range reads per range size")
+    container.add_argument("--key-size", type=int, default=32, help="Key size in bytes")
+    container.add_argument("--chunk-size", type=int, default=CONTAINER_CHUNK_SIZE,
+                           help="Plaintext bytes per container chunk, a multiple of 16")
+    container.add_argument("--directory", default=tempfile.gettempdir(),
+                           help="Where the container is written, then removed (default: %(default)s)")
+    container.add_argument("--output", help="Defaults to dataframes/throughput/container_range_reads.csv")
+    container.add_argument("--no-save", action="store_true", help="Print results without writing a CSV")
+    container.set_defaults(func=container_command)
+
+    sweep = subparsers.add_parser("sweep", help="Out-of-core sweep over 1GB-64GB files: throughput, peak RSS "
+                                                "and I/O wait with streamed or mmapped inputs")
+    streamable = [name for name in cipher_names() if get_cipher(name).new_stream is not None]
+    sweep.add_argument("--ciphers", nargs="+", default=SWEEP_CIPHERS, choices=streamable)
+    sweep.add_argument("--file-sizes", nargs="+", type=int, default=SWEEP_SIZES,
+                       help="File sizes in MB (default: 1GB, 4GB, 16GB and 64GB)")
+    sweep.add_argument("--modes", nargs="+", choices=SWEEP_MODES, default=list(SWEEP_MODES))
+    sweep.add_argument("--key-size", type=int, default=32, help="Key size in bytes")
+    sweep.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                       help="Bytes per chunk, a multiple of the page size")
+    sweep.add_argument("--iterations", type=int, default=1, help="Passes per cipher, mode and file size")
+    sweep.add_argument("--cold", action="store_true", help="Evict each input from the page cache before every pass")
+    sweep.add_argument("--generate", action="store_true",
+                       help="Generate missing test files with test_files/file_creator.py where disk space allows")
+    sweep.add_argument("--seed", type=int, default=0, help="Seed for --generate")
+    sweep.add_argument("--store", default=RESULTS_DIR, help="Results store directory (default: %(default)s)")
+    sweep.add_argument("--output", help="Defaults to dataframes/throughput/large_file_sweep.csv")
+    sweep.add_argument("--no-save", action="store_true", help="Print results without writing the store or a CSV")
+    sweep.set_defaults(func=sweep_command)
+
+    suite = subparsers.add_parser("suite", help="Fast curated regression subset, stored for later comparison")
+    suite.add_argument("--name", help="Save this run as a named baseline, replacing any baseline of that name")
+    suite.add_argument("--store", default=SUITE_DIR, help="Suite results store directory (default: %(default)s)")
+    suite.set_defaults(func=suite_command)
+
+    compare = subparsers.add_parser("compare", help="Diff two suite runs per cell; exits 1 on significant "
+                                                    "regressions")
+    compare.add_argument("baseline", help="Baseline name or run id")
+    compare.add_argument("candidate", nargs="?", default="latest",
+                         help="Baseline name or run id to check (default: the most recent run)")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                         help="Smallest slowdown, as a fraction, that counts as a regression (default: %(default)s)")
+    compare.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                         help="Significance level of the Mann-Whitney U test (default: %(default)s)")
+    compare.add_argument("--store", default=SUITE_DIR, help="Suite results store directory (default: %(default)s)")
+    compare.add_argument("--output", help="Also write the comparison as a CSV")
+    compare.set_defaults(func=compare_command)
+
+    aggregate = subparsers.add_parser("aggregate", help="Total system throughput with every worker encrypting at once")
+    aggregate.add_argument("--cipher", default="aes-cbc", choices=list(CIPHERS))
+    aggregate.add_argument("--key-size", type=int, default=32, help="Key size in bytes")
+    aggregate.add_argument("--file-size", type=int, default=100, help="File size in MB")
+    aggregate.add_argument("--iterations", type=int, default=10)
+    add_input_arguments(aggregate)
+    add_pool_arguments(aggregate)
+    aggregate.set_defaults(func=aggregate_command)
+
+    threads = subparsers.add_parser("threads", help="Chunk-parallel multi-threaded encryption scaling")
+    threads.add_argument("--file-size", type=int, default=1000, help="File size in MB")
+    threads.add_argument("--threads", nargs="+", type=int, help="Thread counts (default: powers of two up to "
+                                                                  "the core count)")
+    add_timing_arguments(threads, 20)
+    threads.add_argument("--output", help="Defaults to dataframes/throughput/thread_scaling_throughputs.csv")
+    threads.add_argument("--no-save", action="store_true", help="Print results without writing a CSV")
+    threads.set_defaults(func=threads_command)
+
+    handshake = subparsers.add_parser("handshake", help="Key agreement handshakes per second across curves")
+    handshake.add_argument("--curves", nargs="+", default=list(CURVES), choices=list(CURVES))
+    handshake.add_argument("--count", type=int, default=5000, help="Handshakes per curve")
+    handshake.add_argument("--workers", type=int, help="Split handshakes across this many processes")
+    handshake.add_argument("--pin", action="store_true", help="Pin each worker to its own core")
+    handshake.add_argument("--output", help="Defaults to dataframes/throughput/handshake_throughputs.csv")
+    handshake.add_argument("--no-save", action="store_true", help="Print results without writing a CSV")
+    handshake.set_defaults(func=handshake_command)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command in ("throughput", "memory"):
+        select_ciphers(parser, args)
+    args.fingerprint = host_fingerprint()
+    report_fingerprint(args.fingerprint)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import numpy as np
+from Crypto.Cipher import AES, ChaCha20
+from Crypto.Random import get_random_bytes
+
+from benchmark.ciphers import BLOCK_SIZE
+
+CHACHA20_HEADER_SIZE = 16  # 8-byte nonce + 8-byte big-endian keystream position
+SLICE_COPY_MIN_LENGTH = 256  # Average message length above which per-message slice copies beat fancy indexing
+
+
+# Messages are packed back to back in one uint8 buffer; offsets has one entry
+# per message boundary, so message i is buffer[offsets[i]:offsets[i + 1]].
+def pack_messages(messages):
+    lengths = np.fromiter((len(message) for message in messages), dtype=np.int64, count=len(messages))
+    offsets = np.zeros(len(messages) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return np.frombuffer(b''.join(messages), dtype=np.uint8), offsets
+
+
+def iter_records(buffer, offsets):
+    """Yield each packed record as a memoryview, e.g. for file.writelines()."""
+    view = memoryview(buffer)
+    for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist()):
+        yield view[start:end]
+
+
+def _copy_messages(destination, destination_starts, source, source_starts, lengths):
+    """Copy source[source_starts[i]:][:lengths[i]] to destination[destination_starts[i]:] for every i.
+
+    Small messages are moved with one fancy-indexing step, since a Python
+    loop would cost more than the copies; large ones with plain slice copies,
+    which avoid building an 8-byte index per byte.
+    """
+    total = int(lengths.sum())
+    if total >= SLICE_COPY_MIN_LENGTH * len(lengths):
+        for destination_start, source_start, length in zip(destination_starts.tolist(), source_starts.tolist(),
+                                                           lengths.tolist()):
+            destination[destination_start:destination_start + length] = source[source_start:source_start + length]
+        return
+    shifts = np.repeat(source_starts, lengths)
+    positions = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    destination[positions + np.repeat(destination_starts, lengths)] = source[positions + shifts]
+
+
+def _gather(source, starts, lengths):
+    """Concatenate source[starts[i]:starts[i] + lengths[i]] for every i; returns (packed, offsets)."""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    packed = np.empty(offsets[-1], dtype=np.uint8)
+    _copy_messages(packed, offsets[:-1], source, starts, lengths)
+    return packed, offsets
+
+
+def aes_encrypt_cbc_batch(buffer, offsets, key):
+    """Encrypt every packed message with AES-CBC and its own random IV in one cipher call.
+
+    Each output record is iv + ciphertext of the padded message, the same
+    layout aes_encrypt_cbc returns. The whole batch is laid out as one
+    plaintext of [random block | padded message] records and encrypted as a
+    single CBC chain: every random block's ciphertext is an unpredictable IV
+    for the message that follows it. Returns (packed records, offsets).
+    """
+    lengths = np.diff(offsets)
+    padding = BLOCK_SIZE - lengths % BLOCK_SIZE
+    record_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(BLOCK_SIZE + lengths + padding, out=record_offsets[1:])
+
+    records = np.empty(record_offsets[-1], dtype=np.uint8)
+    starts = record_offsets[:-1]
+    blocks = np.frombuffer(get_random_bytes(BLOCK_SIZE * len(lengths)), dtype=np.uint8)
+    records[(starts[:, None] + np.arange(BLOCK_SIZE)).ravel()] = blocks
+    _copy_messages(records, starts + BLOCK_SIZE, buffer, offsets[:-1], lengths)
+    padding_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(padding, out=padding_offsets[1:])
+    padding_positions = (np.arange(padding_offsets[-1], dtype=np.int64)
+                         + np.repeat(starts + BLOCK_SIZE + lengths - padding_offsets[:-1], padding))
+    records[padding_positions] = np.repeat(padding, padding).astype(np.uint8)
+
+    # PyCryptodome takes memoryviews of NumPy arrays, not the arrays themselves
+    view = memoryview(records)
+    AES.new(key, AES.MODE_CBC, get_random_bytes(BLOCK_SIZE)).encrypt(view, output=view)
+    return records, record_offsets
+
+
+def aes_decrypt_cbc_batch(buffer, offsets, key):
+    """Decrypt packed aes_encrypt_cbc records in one cipher call; returns (packed messages, offsets).
+
+    Decrypting the batch as a single CBC chain decrypts every block against
+    the ciphertext block before it, which for each message's first block is
+    its IV; only the IV blocks themselves decrypt to garbage and are dropped.
+    Raises ValueError, like unpad, if any record's PKCS#7 padding is invalid.
+    """
+    record_lengths = np.diff(offsets)
+    if np.any(record_lengths < 2 * BLOCK_SIZE) or np.any(record_lengths % BLOCK_SIZE):
+        raise ValueError("Data must be padded to 16 byte boundary in CBC mode")
+    plaintext = np.empty(len(buffer), dtype=np.uint8)
+    AES.new(key, AES.MODE_CBC, bytes(BLOCK_SIZE)).decrypt(memoryview(buffer), output=memoryview(plaintext))
+
+    # Every record's last block must end in padding copies of the byte padding, 1 <= padding <= 16
+    last_blocks = plaintext[offsets[1:, None] - BLOCK_SIZE + np.arange(BLOCK_SIZE)]
+    padding = last_blocks[:, -1].astype(np.int64)
+    in_padding = np.arange(BLOCK_SIZE) >= BLOCK_SIZE - padding[:, None]
+    if np.any(padding < 1) or np.any(padding > BLOCK_SIZE) or np.any(in_padding & (last_blocks != padding[:, None])):
+        raise ValueError("PKCS#7 padding is incorrect.")
+    return _gather(plaintext, offsets[:-1] + BLOCK_SIZE, record_lengths - BLOCK_SIZE - padding)
+
+
+def chacha20_encrypt_batch(buffer, offsets, key):
+    """Encrypt every packed message with ChaCha20 in one cipher call; returns (packed records, offsets).
+
+    Messages are laid out as records with room for a 16-byte header and the
+    whole record buffer is encrypted as one keystream under a fresh random
+    nonce, so each message uses the keystream at its own position in that
+    buffer. The header then records the (nonce, position) pair: no two
+    messages share keystream, and any record can be decrypted on its own by
+    seeking to its position.
+    """
+    lengths = np.diff(offsets)
+    record_offsets = offsets + CHACHA20_HEADER_SIZE * np.arange(len(offsets), dtype=np.int64)
+    records = np.empty(record_offsets[-1], dtype=np.uint8)
+    positions = record_offsets[:-1] + CHACHA20_HEADER_SIZE
+    _copy_messages(records, positions, buffer, offsets[:-1], lengths)
+
+    nonce = get_random_bytes(8)
+    view = memoryview(records)
+    ChaCha20.new(key=key, nonce=nonce).encrypt(view, output=view)  # Header gaps are overwritten below
+
+    headers = np.empty((len(lengths), CHACHA20_HEADER_SIZE), dtype=np.uint8)
+    headers[:, :8] = np.frombuffer(nonce, dtype=np.uint8)
+    headers[:, 8:] = positions.astype('>u8').view(np.uint8).reshape(-1, 8)
+    records[(record_offsets[:-1, None] + np.arange(CHACHA20_HEADER_SIZE)).ravel()] = headers.ravel()
+    return records, record_offsets
+
+
+def chacha20_decrypt_batch(buffer, offsets, key):
+    """Decrypt packed chacha20_encrypt_batch records; returns (packed messages, offsets).
+
+    Records may come from different batches, so each is decrypted on its own,
+    reusing one cipher object per nonce and seeking to the record's position.
+    """
+    lengths = np.diff(offsets) - CHACHA20_HEADER_SIZE
+    message_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=message_offsets[1:])
+    plaintext = np.empty(message_offsets[-1], dtype=np.uint8)
+
+    ciphers = {}
+    view = memoryview(buffer)
+    output = memoryview(plaintext)
+    for start, end, output_start, output_end in zip(offsets[:-1].tolist(), offsets[1:].tolist(),
+                                                    message_offsets[:-1].tolist(), message_offsets[1:].tolist()):
+        nonce = bytes(view[start:start + 8])
+        cipher = ciphers.get(nonce)
+        if cipher is None:
+            cipher = ciphers[nonce] = ChaCha20.new(key=key, nonce=nonce)
+        cipher.seek(int.from_bytes(view[start + 8:start + CHACHA20_HEADER_SIZE], 'big'))
+        cipher.decrypt(view[start + CHACHA20_HEADER_SIZE:end], output=output[output_start:output_end])
+    return plaintext, message_offsets
@@ -0,0 +1,80 @@
+import dataclasses
+import functools
+import hashlib
+import json
+import os
+
+from benchmark.engine import DATAFRAMES_DIR, test_file_path
+from benchmark.host import fingerprint_id, host_fingerprint, library_versions
+
+CACHE_DIR = os.path.join(DATAFRAMES_DIR, 'cache')
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+@functools.lru_cache(maxsize=None)
+def _content_digest(path, size, mtime_ns):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, hashed once per process while size and mtime are unchanged."""
+    stat = os.stat(path)
+    return _content_digest(path, stat.st_size, stat.st_mtime_ns)
+
+
+def cell_key(cipher_name, key_size, file_size, mode, chunk_size, timing):
+    """Return the content address of one (cipher, key size, file size) cell.
+
+    Hashes everything that can change the measurement: the algorithm and key
+    size, input mode and chunk size, timing config, the input file's contents,
+    the crypto library versions and the host fingerprint (CPU, flags,
+    governor, OpenSSL build). Changing any of them misses the
+    cache, so stale cells are recomputed rather than reused.
+    """
+    parameters = {
+        "algorithm": cipher_name,
+        "key_size": key_size,
+        "mode": mode,
+        "chunk_size": chunk_size if mode == "stream" else None,
+        "timing": dataclasses.asdict(timing),
+        "input": file_digest(test_file_path(file_size)),
+        "libraries": library_versions(),
+        "host": fingerprint_id(host_fingerprint()),
+    }
+    return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode()).hexdigest()
+
+
+class CellCache:
+    """Directory of finished cells, one JSON file per cell_key().
+
+    Cells are written as soon as they finish, so an interrupted run loses at
+    most the cell in progress and a rerun only computes what is missing.
+    """
+
+    def __init__(self, path=CACHE_DIR):
+        self.path = path
+
+    def key(self, cipher_name, key_size, file_size, mode, chunk_size, timing):
+        return cell_key(cipher_name, key_size, file_size, mode, chunk_size, timing)
+
+    def _cell_path(self, key):
+        return os.path.join(self.path, f"{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self._cell_path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key, cell):
+        # Write to a temporary file and rename so a crash never leaves a half-written cell
+        os.makedirs(self.path, exist_ok=True)
+        temporary_path = self._cell_path(key) + ".tmp"
+        with open(temporary_path, 'w') as f:
+            json.dump(cell, f)
+        os.replace(temporary_path, self._cell_path(key))
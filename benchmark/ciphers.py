@@ -0,0 +1,801 @@
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from Crypto.Cipher import AES, ARC4, ChaCha20, ChaCha20_Poly1305
+from Crypto.Random import get_random_bytes
+from Crypto.Util.Padding import unpad
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes, padding
+from cryptography.hazmat.primitives.ciphers import Cipher as OpenSSLCipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, AESOCB3, ChaCha20Poly1305
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+BLOCK_SIZE = 16  # AES block size in bytes
+BACKENDS = ("pycryptodome", "cryptography")
+DEFAULT_BACKEND = "pycryptodome"
+TAG_SIZE = 16  # Authentication tag size of every AEAD mode here
+
+
+# PKCS#7 padding that also accepts memoryviews, which Crypto.Util.Padding.pad does not
+def pkcs7_pad(data, block_size=BLOCK_SIZE):
+    padding_length = block_size - len(data) % block_size
+    return b''.join((data, bytes([padding_length]) * padding_length))
+
+
+# AES Encryption in ECB mode
+def aes_encrypt_ecb(data, key):
+    cipher = AES.new(key, AES.MODE_ECB)
+    return cipher.encrypt(pkcs7_pad(data))
+
+
+def aes_decrypt_ecb(data, key):
+    cipher = AES.new(key, AES.MODE_ECB)
+    return unpad(cipher.decrypt(data), BLOCK_SIZE)
+
+
+# AES Encryption in CBC mode, with a fresh random IV unless one is given
+def aes_encrypt_cbc(data, key, iv=None):
+    iv = iv or get_random_bytes(BLOCK_SIZE)
+    cipher = AES.new(key, AES.MODE_CBC, iv)
+    return iv + cipher.encrypt(pkcs7_pad(data))  # Prepend IV to encrypted data
+
+
+def aes_decrypt_cbc(data, key):
+    iv, encrypted_data = data[:BLOCK_SIZE], data[BLOCK_SIZE:]
+    cipher = AES.new(key, AES.MODE_CBC, iv)
+    return unpad(cipher.decrypt(encrypted_data), BLOCK_SIZE)
+
+
+# AES Encryption in CTR mode, output is nonce + ciphertext
+def aes_encrypt_ctr(data, key):
+    cipher = AES.new(key, AES.MODE_CTR, nonce=get_random_bytes(8))
+    return cipher.nonce + cipher.encrypt(data)
+
+
+def aes_decrypt_ctr(data, key):
+    cipher = AES.new(key, AES.MODE_CTR, nonce=data[:8])
+    return cipher.decrypt(data[8:])
+
+
+# AEAD encryption: output is nonce + ciphertext + tag, decryption raises
+# ValueError if the tag does not verify
+def aead_encrypt(cipher, data):
+    ciphertext, tag = cipher.encrypt_and_digest(data)
+    return b''.join((cipher.nonce, ciphertext, tag))
+
+
+def aead_decrypt(new_cipher, data, nonce_size):
+    cipher = new_cipher(data[:nonce_size])
+    return cipher.decrypt_and_verify(data[nonce_size:-TAG_SIZE], data[-TAG_SIZE:])
+
+
+def aes_encrypt_gcm(data, key):
+    return aead_encrypt(AES.new(key, AES.MODE_GCM, nonce=get_random_bytes(12)), data)
+
+
+def aes_decrypt_gcm(data, key):
+    return aead_decrypt(lambda nonce: AES.new(key, AES.MODE_GCM, nonce=nonce), data, 12)
+
+
+def aes_encrypt_ocb(data, key):
+    return aead_encrypt(AES.new(key, AES.MODE_OCB, nonce=get_random_bytes(15)), data)
+
+
+def aes_decrypt_ocb(data, key):
+    return aead_decrypt(lambda nonce: AES.new(key, AES.MODE_OCB, nonce=nonce), data, 15)
+
+
+def chacha20_poly1305_encrypt(data, key):
+    return aead_encrypt(ChaCha20_Poly1305.new(key=key, nonce=get_random_bytes(12)), data)
+
+
+def chacha20_poly1305_decrypt(data, key):
+    return aead_decrypt(lambda nonce: ChaCha20_Poly1305.new(key=key, nonce=nonce), data, 12)
+
+
+# A 24-byte nonce selects XChaCha20-Poly1305, safe to pick at random per message
+def xchacha20_poly1305_encrypt(data, key):
+    return aead_encrypt(ChaCha20_Poly1305.new(key=key, nonce=get_random_bytes(24)), data)
+
+
+def xchacha20_poly1305_decrypt(data, key):
+    return aead_decrypt(lambda nonce: ChaCha20_Poly1305.new(key=key, nonce=nonce), data, 24)
+
+
+# RC4 encryption function
+def rc4_encrypt(data, key):
+    cipher = ARC4.new(key)
+    return cipher.encrypt(data)
+
+
+# RC4 decryption function
+def rc4_decrypt(data, key):
+    cipher = ARC4.new(key)
+    return cipher.decrypt(data)
+
+
+# ChaCha20 encryption function
+def chacha20_encrypt(data, key, nonce):
+    cipher = ChaCha20.new(key=key, nonce=nonce)
+    return cipher.encrypt(data)
+
+
+# ChaCha20 decryption function
+def chacha20_decrypt(data, key, nonce):
+    cipher = ChaCha20.new(key=key, nonce=nonce)
+    return cipher.decrypt(data)
+
+
+class RandomPool:
+    """Hands out random bytes from a buffer refilled with one bulk CSPRNG call.
+
+    take() is a drop-in for get_random_bytes for IVs and nonces: a 16-byte IV
+    costs a slice instead of a syscall. The buffer is discarded in forked
+    children so parent and child never hand out the same bytes. Not
+    thread-safe; use one pool per thread.
+    """
+
+    def __init__(self, size=64 * 1024):
+        self.size = size
+        self._buffer = b''
+        self._position = 0
+        self._pid = os.getpid()
+
+    def take(self, length):
+        if self._position + length > len(self._buffer) or self._pid != os.getpid():
+            self._buffer = get_random_bytes(max(self.size, length))
+            self._position = 0
+            self._pid = os.getpid()
+        start = self._position
+        self._position += length
+        return self._buffer[start:self._position]
+
+
+class CounterNonces:
+    """Unique ChaCha20 nonces without a CSPRNG call per message.
+
+    Each nonce is a random prefix followed by a 32-bit big-endian counter; a
+    new prefix is drawn when the counter wraps or after a fork. size is 12
+    (RFC 7539, 8-byte prefix) or 8 (original ChaCha20, 4-byte prefix, so
+    keep the number of generators per key well below 2**16). Not thread-safe.
+    """
+
+    def __init__(self, size=12):
+        self.size = size
+        self._new_prefix()
+
+    def _new_prefix(self):
+        self._prefix = get_random_bytes(self.size - 4)
+        self._counter = 0
+        self._pid = os.getpid()
+
+    def next(self):
+        if self._counter == 1 << 32 or self._pid != os.getpid():
+            self._new_prefix()
+        nonce = self._prefix + self._counter.to_bytes(4, 'big')
+        self._counter += 1
+        return nonce
+
+
+class AesCbcContext:
+    """AES-CBC with the key expanded once and reused for every message.
+
+    PyCryptodome cannot give an existing CBC object a new IV, so instead the
+    encryptor keeps chaining and each message starts with a fresh random
+    block. That block's ciphertext is unpredictable and serves as the message
+    IV, as with TLS 1.1 explicit IVs, so the output has the same iv +
+    ciphertext layout as aes_encrypt_cbc and either side can decrypt the
+    other's messages. random_bytes supplies the per-message random blocks,
+    e.g. RandomPool().take. Not thread-safe.
+    """
+
+    def __init__(self, key, random_bytes=get_random_bytes):
+        self.random_bytes = random_bytes
+        self._encryptor = AES.new(key, AES.MODE_CBC, get_random_bytes(BLOCK_SIZE))
+        self._decryptor = AES.new(key, AES.MODE_CBC, bytes(BLOCK_SIZE))
+
+    def encrypt(self, data):
+        return self._encryptor.encrypt(b''.join((self.random_bytes(BLOCK_SIZE), pkcs7_pad(data))))
+
+    def decrypt(self, data):
+        # The first output block is garbage from the chained state; every later
+        # block is decrypted against the previous ciphertext block as usual
+        return unpad(self._decryptor.decrypt(data)[BLOCK_SIZE:], BLOCK_SIZE)
+
+
+class ChaCha20Context:
+    """ChaCha20 with one encryptor and one decryptor per key, seeking instead of re-keying.
+
+    Message number n is encrypted with the keystream starting at n * 2**32
+    bytes, so each message gets its own region of the 2**70-byte keystream
+    of a random per-context nonce. Message numbers take the place of nonces:
+    they must be unique per context and messages are limited to 4GB.
+    PyCryptodome locks a cipher object to its first direction, hence the two
+    objects. Not thread-safe.
+    """
+
+    MESSAGE_STRIDE = 1 << 32  # Keystream bytes reserved per message number
+
+    def __init__(self, key, nonce=None):
+        self.nonce = nonce or get_random_bytes(8)
+        self._encryptor = ChaCha20.new(key=key, nonce=self.nonce)
+        self._decryptor = ChaCha20.new(key=key, nonce=self.nonce)
+
+    def encrypt(self, data, message_number):
+        self._encryptor.seek(message_number * self.MESSAGE_STRIDE)
+        return self._encryptor.encrypt(data)
+
+    def decrypt(self, data, message_number):
+        self._decryptor.seek(message_number * self.MESSAGE_STRIDE)
+        return self._decryptor.decrypt(data)
+
+
+class CipherContextCache:
+    """Bounded LRU of cipher contexts keyed by the caller's key id.
+
+    new_context builds a context from a key (AesCbcContext or
+    ChaCha20Context), so every key id pays for its key schedule once while
+    it stays among the max_size most recently used.
+    """
+
+    def __init__(self, new_context, max_size=1024):
+        self.new_context = new_context
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._contexts = OrderedDict()
+
+    def get(self, key_id, key):
+        context = self._contexts.get(key_id)
+        if context is not None:
+            self.hits += 1
+            self._contexts.move_to_end(key_id)
+            return context
+
+        self.misses += 1
+        context = self._contexts[key_id] = self.new_context(key)
+        if len(self._contexts) > self.max_size:
+            self._contexts.popitem(last=False)
+        return context
+
+    def clear(self):
+        self._contexts.clear()
+
+
+# ECC Key Agreement (ECDH, or X25519/X448) to derive shared key
+def derive_shared_key(private_key, peer_public_key, length=32):
+    if isinstance(private_key, ec.EllipticCurvePrivateKey):
+        shared_key = private_key.exchange(ec.ECDH(), peer_public_key)
+    else:
+        shared_key = private_key.exchange(peer_public_key)
+    derived_key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=length,  # AES key size
+        salt=None,
+        info=b'handshake data',
+        backend=default_backend()
+    ).derive(shared_key)
+    return derived_key
+
+
+# curve is an ec.EllipticCurve instance, or X25519PrivateKey/X448PrivateKey
+def generate_ecc_key(curve):
+    if isinstance(curve, ec.EllipticCurve):
+        return ec.generate_private_key(curve, default_backend())
+    return curve.generate()
+
+
+def public_key_bytes(public_key):
+    return public_key.public_bytes(Encoding.DER, PublicFormat.SubjectPublicKeyInfo)
+
+
+class SharedKeyCache:
+    """LRU cache of derived keys keyed by the (private, peer public) key pair.
+
+    Repeated messages between the same two parties reuse the derived key
+    instead of repeating the ECDH exchange and HKDF in derive_shared_key.
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._keys = OrderedDict()
+
+    def get(self, private_key, peer_public_key, length=32):
+        cache_key = (public_key_bytes(private_key.public_key()), public_key_bytes(peer_public_key), length)
+        derived_key = self._keys.get(cache_key)
+        if derived_key is not None:
+            self.hits += 1
+            self._keys.move_to_end(cache_key)
+            return derived_key
+
+        self.misses += 1
+        derived_key = self._keys[cache_key] = derive_shared_key(private_key, peer_public_key, length)
+        if len(self._keys) > self.max_size:
+            self._keys.popitem(last=False)
+        return derived_key
+
+    def clear(self):
+        self._keys.clear()
+
+
+def get_shared_key(private_key, peer_public_key, length=32, key_cache=None):
+    if key_cache is None:
+        return derive_shared_key(private_key, peer_public_key, length)
+    return key_cache.get(private_key, peer_public_key, length)
+
+
+# AES Encryption using the derived ECC shared key
+def ecc_encrypt(data, private_key, peer_public_key, key_size=32, key_cache=None, iv=None):
+    shared_key = get_shared_key(private_key, peer_public_key, key_size, key_cache)
+    iv = iv or os.urandom(16)  # Generate a random IV for AES unless one is given
+    padded_data = pkcs7_pad(data)  # Pad data
+    cipher = AES.new(shared_key, AES.MODE_CBC, iv)
+    return cipher.encrypt(padded_data), iv
+
+
+# AES Decryption using the derived ECC shared key
+def ecc_decrypt(encrypted_data, private_key, peer_public_key, iv, key_size=32, key_cache=None):
+    shared_key = get_shared_key(private_key, peer_public_key, key_size, key_cache)
+    cipher = AES.new(shared_key, AES.MODE_CBC, iv)
+    decrypted_data = cipher.decrypt(encrypted_data)
+    padding_length = decrypted_data[-1]
+    return decrypted_data[:-padding_length]  # Remove padding
+
+
+def measure_speed_ecb(data, key_size):
+    # Encryption
+    start_time = time.perf_counter()
+    key = get_random_bytes(key_size)
+    encrypted_data = aes_encrypt_ecb(data, key)
+    encryption_time = time.perf_counter() - start_time
+
+    # Decryption
+    start_time = time.perf_counter()
+    decrypted_data = aes_decrypt_ecb(encrypted_data, key)
+    decryption_time = time.perf_counter() - start_time
+
+    assert decrypted_data == data, "Decrypted data does not match original!"
+    return encryption_time, decryption_time
+
+
+def measure_speed_cbc(data, key_size):
+    # Encryption
+    start_time = time.perf_counter()
+    key = get_random_bytes(key_size)
+    encrypted_data = aes_encrypt_cbc(data, key)
+    encryption_time = time.perf_counter() - start_time
+
+    # Decryption
+    start_time = time.perf_counter()
+    decrypted_data = aes_decrypt_cbc(encrypted_data, key)
+    decryption_time = time.perf_counter() - start_time
+
+    assert decrypted_data == data, "Decrypted data does not match original!"
+    return encryption_time, decryption_time
+
+
+def measure_round_trip(data, key_size, encrypt, decrypt):
+    # Encryption, including tag generation for AEAD modes
+    start_time = time.perf_counter()
+    key = get_random_bytes(key_size)
+    encrypted_data = encrypt(data, key)
+    encryption_time = time.perf_counter() - start_time
+
+    # Decryption, including tag verification for AEAD modes
+    start_time = time.perf_counter()
+    decrypted_data = decrypt(encrypted_data, key)
+    decryption_time = time.perf_counter() - start_time
+
+    assert decrypted_data == data, "Decrypted data does not match original!"
+    return encryption_time, decryption_time
+
+
+def measure_speed_ctr(data, key_size):
+    return measure_round_trip(data, key_size, aes_encrypt_ctr, aes_decrypt_ctr)
+
+
+def measure_speed_gcm(data, key_size):
+    return measure_round_trip(data, key_size, aes_encrypt_gcm, aes_decrypt_gcm)
+
+
+def measure_speed_ocb(data, key_size):
+    return measure_round_trip(data, key_size, aes_encrypt_ocb, aes_decrypt_ocb)
+
+
+def measure_speed_chacha20_poly1305(data, key_size):
+    return measure_round_trip(data, key_size, chacha20_poly1305_encrypt, chacha20_poly1305_decrypt)
+
+
+def measure_speed_xchacha20_poly1305(data, key_size):
+    return measure_round_trip(data, key_size, xchacha20_poly1305_encrypt, xchacha20_poly1305_decrypt)
+
+
+def measure_file_speed_rc4(data, key_size):
+    # Measure encryption time
+    start = time.perf_counter()
+    key = get_random_bytes(key_size)
+    encrypted_data = rc4_encrypt(data, key)
+    encryption_time = time.perf_counter() - start
+
+    # Measure decryption time
+    start = time.perf_counter()
+    rc4_decrypt(encrypted_data, key)
+    decryption_time = time.perf_counter() - start
+
+    return encryption_time, decryption_time
+
+
+def measure_file_speed_chacha20(data, key_size):
+    # Measure encryption time
+    start = time.perf_counter()
+    key = get_random_bytes(key_size)
+    nonce = get_random_bytes(8)  # ChaCha20 requires an 8-byte nonce
+    encrypted_data = chacha20_encrypt(data, key, nonce)
+    encryption_time = time.perf_counter() - start
+
+    # Measure decryption time
+    start = time.perf_counter()
+    chacha20_decrypt(encrypted_data, key, nonce)
+    decryption_time = time.perf_counter() - start
+
+    return encryption_time, decryption_time
+
+
+def measure_ecc_handshake(key_size=32, curve=ec.SECP256R1()):
+    """Time one full key agreement: two key generations, ECDH and HKDF."""
+    start = time.perf_counter()
+    private_key = generate_ecc_key(curve)
+    peer_public_key = generate_ecc_key(curve).public_key()
+    derive_shared_key(private_key, peer_public_key, key_size)
+    return time.perf_counter() - start
+
+
+def measure_speed_ecc(data, key_size=32):
+    # Key agreement happens up front and is timed separately by
+    # measure_ecc_handshake, so these times cover only the bulk AES-CBC work
+    private_key = generate_ecc_key(ec.SECP256R1())
+    peer_public_key = generate_ecc_key(ec.SECP256R1()).public_key()
+    key_cache = SharedKeyCache()
+    key_cache.get(private_key, peer_public_key, key_size)
+
+    # Measure encryption time
+    start = time.perf_counter()
+    encrypted_data, iv = ecc_encrypt(data, private_key, peer_public_key, key_size, key_cache)
+    encryption_time = time.perf_counter() - start
+
+    # Measure decryption time
+    start = time.perf_counter()
+    decrypted_data = ecc_decrypt(encrypted_data, private_key, peer_public_key, iv, key_size, key_cache)
+    decryption_time = time.perf_counter() - start
+
+    assert decrypted_data == data, "Decrypted data does not match original!"
+    return encryption_time, decryption_time
+
+
+# The same primitives through the cryptography package (OpenSSL), with the
+# same output layouts as the PyCryptodome helpers above
+def openssl_encrypt_ecb(data, key):
+    padder = padding.PKCS7(BLOCK_SIZE * 8).padder()
+    encryptor = OpenSSLCipher(algorithms.AES(key), modes.ECB()).encryptor()
+    return encryptor.update(b''.join((padder.update(data), padder.finalize()))) + encryptor.finalize()
+
+
+def openssl_decrypt_ecb(data, key):
+    decryptor = OpenSSLCipher(algorithms.AES(key), modes.ECB()).decryptor()
+    unpadder = padding.PKCS7(BLOCK_SIZE * 8).unpadder()
+    return unpadder.update(b''.join((decryptor.update(data), decryptor.finalize()))) + unpadder.finalize()
+
+
+def openssl_encrypt_cbc(data, key):
+    iv = get_random_bytes(BLOCK_SIZE)
+    padder = padding.PKCS7(BLOCK_SIZE * 8).padder()
+    encryptor = OpenSSLCipher(algorithms.AES(key), modes.CBC(iv)).encryptor()
+    return iv + encryptor.update(b''.join((padder.update(data), padder.finalize()))) + encryptor.finalize()
+
+
+def openssl_decrypt_cbc(data, key):
+    decryptor = OpenSSLCipher(algorithms.AES(key), modes.CBC(data[:BLOCK_SIZE])).decryptor()
+    unpadder = padding.PKCS7(BLOCK_SIZE * 8).unpadder()
+    return unpadder.update(b''.join((decryptor.update(data[BLOCK_SIZE:]), decryptor.finalize()))) + unpadder.finalize()
+
+
+# OpenSSL CTR and ChaCha20 take a 16-byte initial counter block
+def openssl_encrypt_ctr(data, key):
+    nonce = get_random_bytes(16)
+    return nonce + OpenSSLCipher(algorithms.AES(key), modes.CTR(nonce)).encryptor().update(data)
+
+
+def openssl_decrypt_ctr(data, key):
+    return OpenSSLCipher(algorithms.AES(key), modes.CTR(data[:16])).decryptor().update(data[16:])
+
+
+def openssl_encrypt_chacha20(data, key):
+    nonce = get_random_bytes(16)
+    return nonce + OpenSSLCipher(algorithms.ChaCha20(key, nonce), None).encryptor().update(data)
+
+
+def openssl_decrypt_chacha20(data, key):
+    return OpenSSLCipher(algorithms.ChaCha20(key, data[:16]), None).decryptor().update(data[16:])
+
+
+# AEAD classes return ciphertext + tag and raise InvalidTag on decryption failure
+def openssl_aead_encrypt(aead, data, nonce_size):
+    nonce = get_random_bytes(nonce_size)
+    return nonce + aead.encrypt(nonce, data, None)
+
+
+def openssl_aead_decrypt(aead, data, nonce_size):
+    return aead.decrypt(data[:nonce_size], data[nonce_size:], None)
+
+
+def openssl_encrypt_gcm(data, key):
+    return openssl_aead_encrypt(AESGCM(key), data, 12)
+
+
+def openssl_decrypt_gcm(data, key):
+    return openssl_aead_decrypt(AESGCM(key), data, 12)
+
+
+def openssl_encrypt_ocb(data, key):
+    return openssl_aead_encrypt(AESOCB3(key), data, 12)
+
+
+def openssl_decrypt_ocb(data, key):
+    return openssl_aead_decrypt(AESOCB3(key), data, 12)
+
+
+def openssl_encrypt_chacha20_poly1305(data, key):
+    return openssl_aead_encrypt(ChaCha20Poly1305(key), data, 12)
+
+
+def openssl_decrypt_chacha20_poly1305(data, key):
+    return openssl_aead_decrypt(ChaCha20Poly1305(key), data, 12)
+
+
+def measure_openssl_ecb(data, key_size):
+    return measure_round_trip(data, key_size, openssl_encrypt_ecb, openssl_decrypt_ecb)
+
+
+def measure_openssl_cbc(data, key_size):
+    return measure_round_trip(data, key_size, openssl_encrypt_cbc, openssl_decrypt_cbc)
+
+
+def measure_openssl_ctr(data, key_size):
+    return measure_round_trip(data, key_size, openssl_encrypt_ctr, openssl_decrypt_ctr)
+
+
+def measure_openssl_chacha20(data, key_size):
+    return measure_round_trip(data, key_size, openssl_encrypt_chacha20, openssl_decrypt_chacha20)
+
+
+def measure_openssl_gcm(data, key_size):
+    return measure_round_trip(data, key_size, openssl_encrypt_gcm, openssl_decrypt_gcm)
+
+
+def measure_openssl_ocb(data, key_size):
+    return measure_round_trip(data, key_size, openssl_encrypt_ocb, openssl_decrypt_ocb)
+
+
+def measure_openssl_chacha20_poly1305(data, key_size):
+    return measure_round_trip(data, key_size, openssl_encrypt_chacha20_poly1305, openssl_decrypt_chacha20_poly1305)
+
+
+# Fresh (encryptor, decryptor) cipher object pairs for the streaming benchmark
+def new_stream_ecb(key_size):
+    key = get_random_bytes(key_size)
+    return AES.new(key, AES.MODE_ECB), AES.new(key, AES.MODE_ECB)
+
+
+def new_stream_cbc(key_size):
+    key = get_random_bytes(key_size)
+    iv = get_random_bytes(BLOCK_SIZE)
+    return AES.new(key, AES.MODE_CBC, iv), AES.new(key, AES.MODE_CBC, iv)
+
+
+def new_stream_rc4(key_size):
+    key = get_random_bytes(key_size)
+    return ARC4.new(key), ARC4.new(key)
+
+
+def new_stream_chacha20(key_size):
+    key = get_random_bytes(key_size)
+    nonce = get_random_bytes(8)
+    return ChaCha20.new(key=key, nonce=nonce), ChaCha20.new(key=key, nonce=nonce)
+
+
+def new_stream_ctr(key_size):
+    key = get_random_bytes(key_size)
+    nonce = get_random_bytes(8)
+    return AES.new(key, AES.MODE_CTR, nonce=nonce), AES.new(key, AES.MODE_CTR, nonce=nonce)
+
+
+# AEAD stream pairs: the engine calls encryptor.digest() and
+# decryptor.verify(tag) after the last chunk
+def new_stream_gcm(key_size):
+    key = get_random_bytes(key_size)
+    nonce = get_random_bytes(12)
+    return AES.new(key, AES.MODE_GCM, nonce=nonce), AES.new(key, AES.MODE_GCM, nonce=nonce)
+
+
+def new_stream_chacha20_poly1305(key_size, nonce_size=12):
+    key = get_random_bytes(key_size)
+    nonce = get_random_bytes(nonce_size)
+    return ChaCha20_Poly1305.new(key=key, nonce=nonce), ChaCha20_Poly1305.new(key=key, nonce=nonce)
+
+
+def new_stream_xchacha20_poly1305(key_size):
+    return new_stream_chacha20_poly1305(key_size, nonce_size=24)
+
+
+def new_stream_ecc(key_size):
+    private_key = generate_ecc_key(ec.SECP256R1())
+    peer_public_key = generate_ecc_key(ec.SECP256R1()).public_key()
+    shared_key = derive_shared_key(private_key, peer_public_key, key_size)
+    iv = os.urandom(16)
+    return AES.new(shared_key, AES.MODE_CBC, iv), AES.new(shared_key, AES.MODE_CBC, iv)
+
+
+class OpenSSLStream:
+    """Adapts a cryptography encryptor/decryptor context to the encrypt/decrypt
+    interface of PyCryptodome cipher objects used by the streaming benchmark."""
+
+    def __init__(self, context):
+        self._context = context
+
+    def encrypt(self, data):
+        return self._context.update(data)
+
+    decrypt = encrypt
+
+    def digest(self):
+        self._context.finalize()
+        return self._context.tag
+
+    def verify(self, tag):
+        self._context.finalize_with_tag(tag)
+
+
+def new_openssl_stream(key_size, algorithm, mode=None):
+    """key_size -> (encryptor, decryptor) for algorithm(key) and mode(), e.g. AES and a fresh CBC IV."""
+    key = get_random_bytes(key_size)
+    cipher = OpenSSLCipher(algorithm(key), mode)
+    return OpenSSLStream(cipher.encryptor()), OpenSSLStream(cipher.decryptor())
+
+
+def new_openssl_stream_ecb(key_size):
+    return new_openssl_stream(key_size, algorithms.AES, modes.ECB())
+
+
+def new_openssl_stream_cbc(key_size):
+    return new_openssl_stream(key_size, algorithms.AES, modes.CBC(get_random_bytes(BLOCK_SIZE)))
+
+
+def new_openssl_stream_ctr(key_size):
+    return new_openssl_stream(key_size, algorithms.AES, modes.CTR(get_random_bytes(16)))
+
+
+def new_openssl_stream_chacha20(key_size):
+    nonce = get_random_bytes(16)
+    return new_openssl_stream(key_size, lambda key: algorithms.ChaCha20(key, nonce))
+
+
+def new_openssl_stream_gcm(key_size):
+    key = get_random_bytes(key_size)
+    iv = get_random_bytes(12)
+    encryptor = OpenSSLCipher(algorithms.AES(key), modes.GCM(iv)).encryptor()
+    decryptor = OpenSSLCipher(algorithms.AES(key), modes.GCM(iv)).decryptor()  # Tag is given to verify()
+    return OpenSSLStream(encryptor), OpenSSLStream(decryptor)
+
+
+@dataclass(frozen=True)
+class Cipher:
+    """A benchmarkable algorithm and the key sizes it is run with."""
+    name: str
+    family: str  # Groups rows into dataframes/throughput/{family}_*.csv
+    label: str  # Formatted with bits= and operation= for CSV rows
+    key_sizes: Tuple[int, ...]
+    measure: Callable[[bytes, int], Tuple[float, float]]
+    new_stream: Optional[Callable[[int], tuple]] = None  # key_size -> (encryptor, decryptor)
+    padded: bool = False  # Block mode that needs PKCS#7 padding on the final block
+    supports_output: bool = False  # Cipher objects accept output= for zero-copy encryption
+    authenticated: bool = False  # AEAD: streams finish with encryptor.digest() and decryptor.verify(tag)
+    backend: str = DEFAULT_BACKEND  # Library implementing the primitive, one of BACKENDS
+    handshake: Optional[Callable[[int], float]] = None  # key_size -> key agreement latency in seconds
+
+    def row_label(self, key_size, operation):
+        return self.label.format(bits=key_size * 8, operation=operation)
+
+    def supports_mode(self, mode):
+        """Whether the engine can prepare inputs for this cipher in the given input mode."""
+        if mode == "stream":
+            return self.new_stream is not None
+        if mode == "zero-copy":
+            return self.supports_output
+        return True
+
+
+# Registry of every algorithm the engine can run, in CSV row order. Ciphers
+# from other backends are registered as "<name>@<backend>".
+CIPHERS = {}
+
+
+def register(cipher):
+    CIPHERS[cipher.name] = cipher
+    return cipher
+
+
+def get_cipher(name):
+    try:
+        return CIPHERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown cipher {name!r}, expected one of {', '.join(CIPHERS)}") from None
+
+
+def backend_cipher_name(name, backend):
+    return name if backend == DEFAULT_BACKEND else f"{name}@{backend}"
+
+
+def cipher_names(backend=DEFAULT_BACKEND):
+    """Names of the ciphers registered for backend, without the backend suffix."""
+    return [name.split('@')[0] for name, cipher in CIPHERS.items() if cipher.backend == backend]
+
+
+def resolve_backends(names, backends, mode="read"):
+    """Registered cipher names for every (backend, name) pair, skipping primitives or modes a backend lacks."""
+    resolved = []
+    for backend in backends:
+        for name in names:
+            if backend_cipher_name(name, backend) not in CIPHERS:
+                print(f"{backend} has no {name} implementation, skipping")
+            elif not get_cipher(backend_cipher_name(name, backend)).supports_mode(mode):
+                print(f"{backend} has no {mode} implementation of {name}, skipping")
+            else:
+                resolved.append(backend_cipher_name(name, backend))
+    return resolved
+
+
+register(Cipher("aes-cbc", "aes", "AES-{bits} CBC", (16, 24, 32), measure_speed_cbc,
+                new_stream=new_stream_cbc, padded=True, supports_output=True))
+register(Cipher("aes-ecb", "aes", "AES-{bits} ECB", (16, 24, 32), measure_speed_ecb,
+                new_stream=new_stream_ecb, padded=True, supports_output=True))
+register(Cipher("rc4", "stream_cipher", "RC4-{bits}-bit", (16, 24, 32), measure_file_speed_rc4,
+                new_stream=new_stream_rc4))
+register(Cipher("chacha20", "stream_cipher", "ChaCha20-{bits}-bit", (32,), measure_file_speed_chacha20,
+                new_stream=new_stream_chacha20, supports_output=True))
+register(Cipher("ecc", "ecc", "ECC {operation}", (32,), measure_speed_ecc,
+                new_stream=new_stream_ecc, padded=True, supports_output=True, handshake=measure_ecc_handshake))
+register(Cipher("aes-ctr", "aes", "AES-{bits} CTR", (16, 24, 32), measure_speed_ctr,
+                new_stream=new_stream_ctr, supports_output=True))
+# OCB buffers partial blocks between encrypt() calls, so it has no chunk-for-chunk streaming path
+register(Cipher("aes-gcm", "aead", "AES-{bits} GCM", (16, 24, 32), measure_speed_gcm,
+                new_stream=new_stream_gcm, supports_output=True, authenticated=True))
+register(Cipher("aes-ocb", "aead", "AES-{bits} OCB", (16, 24, 32), measure_speed_ocb))
+register(Cipher("chacha20-poly1305", "aead", "ChaCha20-Poly1305", (32,), measure_speed_chacha20_poly1305,
+                new_stream=new_stream_chacha20_poly1305, supports_output=True, authenticated=True))
+register(Cipher("xchacha20-poly1305", "aead", "XChaCha20-Poly1305", (32,), measure_speed_xchacha20_poly1305,
+                new_stream=new_stream_xchacha20_poly1305, supports_output=True, authenticated=True))
+
+# cryptography (OpenSSL) has no RC4 outside its deprecated "decrepit" module and
+# no XChaCha20-Poly1305. update_into() needs block_size - 1 spare output bytes,
+# so none of these run in zero-copy mode.
+register(Cipher("aes-cbc@cryptography", "aes", "AES-{bits} CBC (cryptography)", (16, 24, 32), measure_openssl_cbc,
+                new_stream=new_openssl_stream_cbc, padded=True, backend="cryptography"))
+register(Cipher("aes-ecb@cryptography", "aes", "AES-{bits} ECB (cryptography)", (16, 24, 32), measure_openssl_ecb,
+                new_stream=new_openssl_stream_ecb, padded=True, backend="cryptography"))
+register(Cipher("chacha20@cryptography", "stream_cipher", "ChaCha20-{bits}-bit (cryptography)", (32,),
+                measure_openssl_chacha20, new_stream=new_openssl_stream_chacha20, backend="cryptography"))
+register(Cipher("aes-ctr@cryptography", "aes", "AES-{bits} CTR (cryptography)", (16, 24, 32), measure_openssl_ctr,
+                new_stream=new_openssl_stream_ctr, backend="cryptography"))
+register(Cipher("aes-gcm@cryptography", "aead", "AES-{bits} GCM (cryptography)", (16, 24, 32), measure_openssl_gcm,
+                new_stream=new_openssl_stream_gcm, authenticated=True, backend="cryptography"))
+register(Cipher("aes-ocb@cryptography", "aead", "AES-{bits} OCB (cryptography)", (16, 24, 32), measure_openssl_ocb,
+                backend="cryptography"))
+register(Cipher("chacha20-poly1305@cryptography", "aead", "ChaCha20-Poly1305 (cryptography)", (32,),
+                measure_openssl_chacha20_poly1305, backend="cryptography"))
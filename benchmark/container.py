@@ -0,0 +1,272 @@
+import os
+import random
+import struct
+import tempfile
+import time
+from dataclasses import dataclass
+
+from Crypto.Cipher import AES, ChaCha20, ChaCha20_Poly1305
+from Crypto.Random import get_random_bytes
+
+from benchmark.ciphers import BLOCK_SIZE, TAG_SIZE, get_cipher
+from benchmark.engine import DATAFRAMES_DIR, save_to_csv, test_file_path
+from benchmark.stats import percentile
+from benchmark.streaming import iter_chunks
+
+# Layout: header | chunk 0 | chunk 1 | ... | index | trailer. Each chunk is
+# its ciphertext followed by a TAG_SIZE tag when the algorithm is an AEAD.
+# The index has one (file offset, stored length) entry per chunk and is
+# written last, so a writer needs neither the plaintext length up front nor
+# to seek back; the fixed-size trailer at the end of the file locates it.
+MAGIC = b"BCNT"
+VERSION = 1
+HEADER = struct.Struct("!4sBBBx16s12sI")  # Magic, version, algorithm id, flags, key id, nonce base, chunk size
+INDEX_ENTRY = struct.Struct("!QI")  # Chunk offset, stored length
+TRAILER = struct.Struct("!QQI4s")  # Index offset, plaintext length, chunk count, magic
+CHUNK_AAD = struct.Struct("!Q?")  # Chunk number, final chunk
+FLAG_TAGS = 1
+CONTAINER_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class ContainerAlgorithm:
+    """How one algorithm maps a chunk to ciphertext.
+
+    Stream ciphers encrypt the whole payload as one keystream, so a chunk is
+    decrypted by seeking to its plaintext offset. AEADs seal every chunk on
+    its own with nonce base XOR chunk number, authenticating the header,
+    the chunk number and whether it is the final chunk, so chunks cannot be
+    reordered, moved between containers or dropped from the end unnoticed.
+    """
+    name: str
+    id: int
+    authenticated: bool
+
+    def encrypt(self, key, nonce_base, number, offset, data, is_last, header):
+        if self.authenticated:
+            cipher = self._new_aead(key, nonce_base, number)
+            cipher.update(header + CHUNK_AAD.pack(number, is_last))
+            ciphertext, tag = cipher.encrypt_and_digest(data)
+            return ciphertext + tag
+        return self._new_stream(key, nonce_base, offset).encrypt(data)
+
+    def decrypt(self, key, nonce_base, number, offset, data, is_last, header):
+        if self.authenticated:
+            cipher = self._new_aead(key, nonce_base, number)
+            cipher.update(header + CHUNK_AAD.pack(number, is_last))
+            return cipher.decrypt_and_verify(data[:-TAG_SIZE], data[-TAG_SIZE:])
+        return self._new_stream(key, nonce_base, offset).decrypt(data)
+
+    def _new_aead(self, key, nonce_base, number):
+        nonce = (int.from_bytes(nonce_base, 'big') ^ number).to_bytes(12, 'big')
+        if self.name == "aes-gcm":
+            return AES.new(key, AES.MODE_GCM, nonce=nonce)
+        return ChaCha20_Poly1305.new(key=key, nonce=nonce)
+
+    def _new_stream(self, key, nonce_base, offset):
+        if self.name == "aes-ctr":
+            # 8-byte nonce and a 64-bit block counter starting at the chunk's block
+            return AES.new(key, AES.MODE_CTR, nonce=nonce_base[:8], initial_value=offset // BLOCK_SIZE)
+        cipher = ChaCha20.new(key=key, nonce=nonce_base)
+        cipher.seek(offset)
+        return cipher
+
+
+CONTAINER_ALGORITHMS = {algorithm.name: algorithm for algorithm in (
+    ContainerAlgorithm("aes-ctr", 1, authenticated=False),
+    ContainerAlgorithm("chacha20", 2, authenticated=False),
+    ContainerAlgorithm("aes-gcm", 3, authenticated=True),
+    ContainerAlgorithm("chacha20-poly1305", 4, authenticated=True),
+)}
+ALGORITHMS_BY_ID = {algorithm.id: algorithm for algorithm in CONTAINER_ALGORITHMS.values()}
+
+
+@dataclass(frozen=True)
+class ContainerHeader:
+    algorithm: ContainerAlgorithm
+    key_id: bytes  # Up to 16 bytes naming the key, e.g. a CipherContextCache key id
+    nonce_base: bytes
+    chunk_size: int
+
+    def pack(self):
+        flags = FLAG_TAGS if self.algorithm.authenticated else 0
+        return HEADER.pack(MAGIC, VERSION, self.algorithm.id, flags, self.key_id, self.nonce_base, self.chunk_size)
+
+    @classmethod
+    def unpack(cls, data):
+        magic, version, algorithm_id, flags, key_id, nonce_base, chunk_size = HEADER.unpack(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a version 1 container")
+        algorithm = ALGORITHMS_BY_ID.get(algorithm_id)
+        if algorithm is None or bool(flags & FLAG_TAGS) != algorithm.authenticated:
+            raise ValueError(f"Unknown algorithm {algorithm_id} or flags {flags:#x}")
+        return cls(algorithm, key_id.rstrip(b'\0'), nonce_base, chunk_size)
+
+
+class ContainerWriter:
+    """Write plaintext of any length into a container on an open binary file.
+
+    Plaintext is buffered until a full chunk plus at least one more byte has
+    arrived, so the chunk written by close() is always the final one.
+    """
+
+    def __init__(self, f, algorithm, key, key_id=b'', chunk_size=CONTAINER_CHUNK_SIZE):
+        if chunk_size % BLOCK_SIZE:
+            raise ValueError(f"Chunk size must be a multiple of {BLOCK_SIZE}")
+        if len(key_id) > 16:
+            raise ValueError("Key id must be at most 16 bytes")
+        self.f = f
+        self.key = key
+        self.header = ContainerHeader(CONTAINER_ALGORITHMS[algorithm], key_id, get_random_bytes(12), chunk_size)
+        self._packed_header = self.header.pack()
+        self._buffer = bytearray()
+        self._index = []
+        self._length = 0
+        self._offset = f.tell()
+        f.write(self._packed_header)
+
+    def _write_chunk(self, data, is_last):
+        number = len(self._index)
+        chunk = self.header.algorithm.encrypt(self.key, self.header.nonce_base, number,
+                                              number * self.header.chunk_size, data, is_last, self._packed_header)
+        self._index.append((self.f.tell() - self._offset, len(chunk)))
+        self.f.write(chunk)
+        self._length += len(data)
+
+    def write(self, data):
+        self._buffer += data
+        chunk_size = self.header.chunk_size
+        if len(self._buffer) > chunk_size:
+            with memoryview(self._buffer) as view:
+                end = (len(self._buffer) - 1) // chunk_size * chunk_size
+                for start in range(0, end, chunk_size):
+                    self._write_chunk(view[start:start + chunk_size], False)
+            del self._buffer[:end]
+
+    def close(self):
+        """Write the final chunk (empty for empty plaintext), the index and the trailer."""
+        self._write_chunk(bytes(self._buffer), True)
+        self._buffer.clear()
+        index_offset = self.f.tell() - self._offset
+        self.f.write(b''.join(INDEX_ENTRY.pack(*entry) for entry in self._index))
+        self.f.write(TRAILER.pack(index_offset, self._length, len(self._index), MAGIC))
+
+
+class ContainerReader:
+    """Random-access reads from a container on a seekable binary file.
+
+    Opening reads only the header, trailer and index; read_range() then
+    seeks to and decrypts just the chunks overlapping the requested range.
+    """
+
+    def __init__(self, f, key):
+        self.f = f
+        self.key = key
+        self._offset = f.tell()
+        self._packed_header = f.read(HEADER.size)
+        self.header = ContainerHeader.unpack(self._packed_header)
+        f.seek(-TRAILER.size, os.SEEK_END)
+        index_offset, self.length, count, magic = TRAILER.unpack(f.read(TRAILER.size))
+        if magic != MAGIC:
+            raise ValueError("Container trailer is missing or truncated")
+        f.seek(self._offset + index_offset)
+        index = f.read(count * INDEX_ENTRY.size)
+        self.index = [INDEX_ENTRY.unpack_from(index, i * INDEX_ENTRY.size) for i in range(count)]
+
+    def chunk(self, number):
+        """Decrypt and, for AEADs, verify one chunk; raises ValueError if its tag does not match."""
+        offset, length = self.index[number]
+        self.f.seek(self._offset + offset)
+        return self.header.algorithm.decrypt(self.key, self.header.nonce_base, number,
+                                             number * self.header.chunk_size, self.f.read(length),
+                                             number == len(self.index) - 1, self._packed_header)
+
+    def read_range(self, start, length):
+        """Plaintext bytes [start, start + length), clipped to the payload length."""
+        end = min(start + length, self.length)
+        if start >= end:
+            return b''
+        chunk_size = self.header.chunk_size
+        first, last = start // chunk_size, (end - 1) // chunk_size
+        data = b''.join(self.chunk(number) for number in range(first, last + 1))
+        return data[start - first * chunk_size:end - first * chunk_size]
+
+    def __iter__(self):
+        """Yield the plaintext chunk by chunk."""
+        for number in range(len(self.index)):
+            yield self.chunk(number)
+
+
+def encrypt_to_container(source_path, destination_path, algorithm, key, key_id=b'', chunk_size=CONTAINER_CHUNK_SIZE):
+    with open(destination_path, 'wb') as f:
+        writer = ContainerWriter(f, algorithm, key, key_id, chunk_size)
+        for data in iter_chunks(source_path, 8 * 1024 * 1024):
+            writer.write(data)
+        writer.close()
+
+
+def measure_container(algorithm, key_size, file_size, range_sizes, reads=200, chunk_size=CONTAINER_CHUNK_SIZE,
+                      directory=None, seed=0):
+    """Time full decryption of a test file's container against random range reads.
+
+    The container is written to directory (untimed) and removed afterwards.
+    Range reads start at offsets drawn uniformly with a fixed seed. Returns
+    {"full": seconds, "ranges": {range size: {"p50"/"p99": ms, "speedup":
+    full time / median range read}}}.
+    """
+    key = get_random_bytes(key_size)
+    path = os.path.join(directory or tempfile.gettempdir(), f"test_{file_size}MB.{algorithm}.bcnt")
+    encrypt_to_container(test_file_path(file_size), path, algorithm, key, chunk_size=chunk_size)
+    generator = random.Random(seed)
+    try:
+        with open(path, 'rb') as f:
+            reader = ContainerReader(f, key)
+            start = time.perf_counter()
+            for data in reader:
+                pass
+            full_time = time.perf_counter() - start
+
+            ranges = {}
+            for size in range_sizes:
+                latencies = []
+                for i in range(reads):
+                    offset = generator.randrange(max(reader.length - size, 0) + 1)
+                    start = time.perf_counter()
+                    reader.read_range(offset, size)
+                    latencies.append(time.perf_counter() - start)
+                median = percentile(latencies, 50)
+                ranges[size] = {"p50": median * 1000, "p99": percentile(latencies, 99) * 1000,
+                                "speedup": full_time / median}
+    finally:
+        os.remove(path)
+    return {"full": full_time, "ranges": ranges}
+
+
+def run_container(algorithms, file_sizes, range_sizes, key_size=32, reads=200, chunk_size=CONTAINER_CHUNK_SIZE,
+                  directory=None, verbose=True):
+    results = {}
+    for algorithm in algorithms:
+        label = get_cipher(algorithm).row_label(key_size, "Decryption")
+        for file_size in file_sizes:
+            result = results[(algorithm, file_size)] = measure_container(algorithm, key_size, file_size,
+                                                                         range_sizes, reads, chunk_size, directory)
+            if verbose:
+                print(f"File: test_{file_size}MB.txt, {label}: Full Decryption {result['full'] * 1000:.2f} ms "
+                      f"({file_size / result['full']:.2f} MB/s)")
+                for size, latency in result["ranges"].items():
+                    print(f"File: test_{file_size}MB.txt, {label}, {size} B Range: p50 {latency['p50']:.3f} ms, "
+                          f"p99 {latency['p99']:.3f} ms ({latency['speedup']:.0f}x faster than full)")
+    return results
+
+
+def save_container(results, key_size=32, output=None):
+    output = output or os.path.join(DATAFRAMES_DIR, 'throughput', 'container_range_reads.csv')
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    rows = [["Method", "File Size (MB)", "Full Decryption (ms)", "Range Size (B)", "Range p50 (ms)",
+             "Range p99 (ms)", "Speedup"]]
+    for (algorithm, file_size), result in results.items():
+        label = get_cipher(algorithm).row_label(key_size, "Decryption")
+        for size, latency in result["ranges"].items():
+            rows.append([label, file_size, result["full"] * 1000, size, latency["p50"], latency["p99"],
+                         latency["speedup"]])
+    save_to_csv(output, rows)
@@ -0,0 +1,289 @@
+import csv
+import os
+
+import psutil
+
+from benchmark.ciphers import get_cipher
+from benchmark.host import save_fingerprint
+from benchmark.inputs import MappedInput, page_faults
+from benchmark.streaming import DEFAULT_CHUNK_SIZE, iter_chunks, measure_stream
+from benchmark.timing import DEFAULT_TIMING, collect_iterations, summarize
+from benchmark.zero_copy import ZeroCopyBuffers
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+TEST_FILES_DIR = os.path.join(REPO_ROOT, 'test_files')
+DATAFRAMES_DIR = os.path.join(REPO_ROOT, 'dataframes')
+
+FILE_SIZES = [1, 10, 100, 1000]  # File sizes in MB
+WARMUP_BYTES = 64 * 1024
+MODES = ("read", "mmap", "stream", "zero-copy")
+STATISTICS = ("ci_low", "ci_high", "median", "p95", "p99")
+
+
+def test_file_path(file_size):
+    """Path of the file_size MB test file, named as test_files/file_creator.py does: 1024 MB is test_1GB.txt."""
+    for unit, megabytes in (("TB", 1024 * 1024), ("GB", 1024), ("MB", 1)):
+        if file_size % megabytes == 0:
+            return os.path.join(TEST_FILES_DIR, f'test_{file_size // megabytes}{unit}.txt')
+
+
+def load_input(file_size):
+    with open(test_file_path(file_size), 'rb') as f:
+        return f.read()
+
+
+# Save results to CSV
+def save_to_csv(file_name, data):
+    with open(file_name, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerows(data)
+    save_fingerprint(file_name)
+
+
+def warm_up(ciphers):
+    """Run every cipher once on a small buffer so imports and caches are hot."""
+    data = os.urandom(WARMUP_BYTES)
+    for cipher in ciphers:
+        for key_size in cipher.key_sizes:
+            cipher.measure(data, key_size)
+
+
+def check_mode(ciphers, mode):
+    """Raise ValueError if any cipher cannot run in the given input mode."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {', '.join(MODES)}")
+    unsupported = [cipher.name for cipher in ciphers if not cipher.supports_mode(mode)]
+    if unsupported:
+        raise ValueError(f"No {mode} implementation for {', '.join(unsupported)}")
+
+
+def prepare_input(file_size, mode="read", chunk_size=DEFAULT_CHUNK_SIZE, buffers=None):
+    """Prepare one test file for the given mode.
+
+    Returns (measure, close) where measure(cipher, key_size) times one
+    encrypt/decrypt round trip and close() releases the input. Zero-copy mode
+    reuses buffers if given, otherwise allocates a fresh ZeroCopyBuffers.
+    """
+    path = test_file_path(file_size)
+    if mode == "read":
+        data = load_input(file_size)
+
+        def measure(cipher, key_size):
+            return cipher.measure(data, key_size)
+        return measure, lambda: None
+
+    if mode == "mmap":
+        mapped = MappedInput(path)
+
+        def measure(cipher, key_size):
+            return cipher.measure(mapped.view, key_size)
+        return measure, mapped.close
+
+    if mode == "stream":
+        def measure(cipher, key_size):
+            return measure_stream(cipher, iter_chunks(path, chunk_size), key_size)
+        return measure, lambda: None
+
+    buffers = buffers or ZeroCopyBuffers(file_size * 1024 * 1024)
+    buffers.load(path)
+    return buffers.measure, lambda: None
+
+
+def run_cell(cipher, key_size, file_size, measure, timing=DEFAULT_TIMING, verbose=True):
+    """Time encrypt/decrypt round trips of one (cipher, key size, file size) cell.
+
+    Iterations run through the timing harness (warmup, then adaptive until the
+    target relative standard error). Returns a dict with "encrypt" and
+    "decrypt" throughput (total MB over total seconds) plus their bootstrap
+    "*_ci_low"/"*_ci_high" and "*_median"/"*_p95"/"*_p99" latencies (ms), the
+    number of "iterations", the raw per-iteration "samples" as (encryption
+    seconds, decryption seconds, RSS bytes), average "memory" RSS (MB),
+    "minor_faults"/"major_faults" counts and, for ciphers with a key agreement
+    step, average "handshake" latency (ms). The handshake is timed on its own
+    so it does not distort bulk throughput. Warmup and outlier iterations are
+    left out of every metric.
+    """
+    # Track memory usage, handshake latency and page faults alongside the timings
+    memory_usage = []
+    handshake_latency = []
+    initial_faults = []
+
+    def iteration():
+        if len(memory_usage) == timing.warmup:  # First timed iteration
+            initial_faults.extend(page_faults())
+        encryption_time, decryption_time = measure(cipher, key_size)
+        memory_usage.append(psutil.Process().memory_info().rss)
+        if cipher.handshake is not None:
+            handshake_latency.append(cipher.handshake(key_size) * 1000)
+        return encryption_time, decryption_time
+
+    (encryption_times, decryption_times), kept = collect_iterations(iteration, timing)
+    # Drop samples taken during warmup and in rejected iterations
+    memory_usage = [memory_usage[timing.warmup:][index] for index in kept]
+    handshake_latency = [handshake_latency[timing.warmup:][index] for index in kept] if handshake_latency else []
+
+    minor_faults, major_faults = page_faults()
+    minor_faults -= initial_faults[0]
+    major_faults -= initial_faults[1]
+    encryption = summarize(encryption_times, file_size)
+    decryption = summarize(decryption_times, file_size)
+    avg_memory_usage = sum(memory_usage) / len(memory_usage) / (1024 * 1024)
+    avg_handshake_latency = sum(handshake_latency) / len(handshake_latency) if handshake_latency else None
+
+    if verbose:
+        print(f"File: test_{file_size}MB.txt, {cipher.row_label(key_size, 'Encryption')}: "
+              f"Encryption Throughput: {encryption['throughput']:.2f} MB/s "
+              f"[{encryption['ci_low']:.2f}, {encryption['ci_high']:.2f}], "
+              f"Decryption Throughput: {decryption['throughput']:.2f} MB/s "
+              f"[{decryption['ci_low']:.2f}, {decryption['ci_high']:.2f}], "
+              f"Avg Memory Usage: {avg_memory_usage:.2f} MB")
+        print(f"{encryption['iterations']} Iterations, "
+              f"Encryption Median/p95/p99: {encryption['median']:.3f}/{encryption['p95']:.3f}/"
+              f"{encryption['p99']:.3f} ms, "
+              f"Decryption Median/p95/p99: {decryption['median']:.3f}/{decryption['p95']:.3f}/"
+              f"{decryption['p99']:.3f} ms, "
+              f"Page Faults: {minor_faults} minor, {major_faults} major")
+        if avg_handshake_latency is not None:
+            print(f"Avg Handshake Latency: {avg_handshake_latency:.3f} ms")
+
+    cell = {"encrypt": encryption["throughput"], "decrypt": decryption["throughput"],
+            "iterations": encryption["iterations"],
+            "samples": list(zip(encryption_times, decryption_times, memory_usage))}
+    for operation, summary in (("encrypt", encryption), ("decrypt", decryption)):
+        for statistic in STATISTICS:
+            cell[f"{operation}_{statistic}"] = summary[statistic]
+    cell.update({
+        "memory": avg_memory_usage,
+        "minor_faults": minor_faults,
+        "major_faults": major_faults,
+        "handshake": avg_handshake_latency,
+    })
+    return cell
+
+
+def empty_results(ciphers):
+    fields = ["encrypt", "decrypt", "iterations", "samples"]
+    fields += [f"{operation}_{statistic}" for operation in ("encrypt", "decrypt") for statistic in STATISTICS]
+    fields += ["memory", "minor_faults", "major_faults", "handshake"]
+    return {
+        (cipher.name, key_size): {field: [] for field in fields}
+        for cipher in ciphers for key_size in cipher.key_sizes
+    }
+
+
+def add_cell(results, cipher_name, key_size, cell):
+    for field, value in cell.items():
+        results[(cipher_name, key_size)][field].append(value)
+
+
+def run_benchmark(cipher_names, file_sizes=FILE_SIZES, timing=DEFAULT_TIMING, mode="read",
+                  chunk_size=DEFAULT_CHUNK_SIZE, verbose=True, cache=None):
+    """Run every (cipher, key size) over every file size.
+
+    Each input is prepared once per file size and shared by all ciphers:
+      read:      the file is read into one bytes object
+      mmap:      the file is memory-mapped and passed as a read-only memoryview
+      stream:    the file is streamed from disk in chunk_size pieces, keeping
+                 memory bounded by the chunk size
+      zero-copy: the file is read into one reusable buffer and encrypted into
+                 preallocated output
+
+    With a cache (benchmark.cache.CellCache), cells already computed with the
+    same parameters are loaded instead of rerun, and every new cell is
+    checkpointed as soon as it finishes. File sizes whose cells are all cached
+    are not loaded at all.
+
+    Returns a dict mapping (cipher name, key size) to per-file-size lists of
+    the run_cell() fields.
+    """
+    ciphers = [get_cipher(name) for name in cipher_names]
+    check_mode(ciphers, mode)
+    buffers = ZeroCopyBuffers(max(file_sizes) * 1024 * 1024) if mode == "zero-copy" else None
+    warm_up(ciphers)
+
+    results = empty_results(ciphers)
+    for file_size in file_sizes:
+        cells, keys = cached_cells(cache, ciphers, file_size, mode, chunk_size, timing, verbose)
+        if len(cells) < len(keys):
+            measure, close = prepare_input(file_size, mode, chunk_size, buffers)
+            try:
+                for cipher in ciphers:
+                    for key_size in cipher.key_sizes:
+                        if (cipher.name, key_size) in cells:
+                            continue
+                        cell = run_cell(cipher, key_size, file_size, measure, timing, verbose)
+                        cells[(cipher.name, key_size)] = cell
+                        if cache is not None:
+                            cache.put(keys[(cipher.name, key_size)], cell)
+            finally:
+                # Release this input before preparing the next one
+                close()
+                measure = None
+
+        for cipher in ciphers:
+            for key_size in cipher.key_sizes:
+                add_cell(results, cipher.name, key_size, cells[(cipher.name, key_size)])
+
+    return results
+
+
+def cached_cells(cache, ciphers, file_size, mode, chunk_size, timing, verbose=True):
+    """Look up every cell of one file size in the cache.
+
+    Returns ({(cipher name, key size): cell} for the cached cells,
+    {(cipher name, key size): cache key} for all cells). Without a cache no
+    cells are cached and every key is None.
+    """
+    cells = {}
+    keys = {}
+    for cipher in ciphers:
+        for key_size in cipher.key_sizes:
+            if cache is None:
+                keys[(cipher.name, key_size)] = None
+                continue
+            key = keys[(cipher.name, key_size)] = cache.key(cipher.name, key_size, file_size, mode, chunk_size,
+                                                            timing)
+            cell = cache.get(key)
+            if cell is not None:
+                cells[(cipher.name, key_size)] = cell
+                if verbose:
+                    print(f"File: test_{file_size}MB.txt, {cipher.row_label(key_size, 'Encryption')}: "
+                          f"Cached, Encryption Throughput: {cell['encrypt']:.2f} MB/s, "
+                          f"Decryption Throughput: {cell['decrypt']:.2f} MB/s")
+    return cells, keys
+
+
+def save_throughputs(results, file_sizes=FILE_SIZES, output_dir=None):
+    """Write results as the wide per-family CSVs that graphs/graphs.py reads.
+
+    Key agreement latencies (ms) go to handshake_latencies.csv and the
+    per-cell confidence intervals and latency percentiles to
+    timing_statistics.csv alongside them.
+    """
+    output_dir = output_dir or os.path.join(DATAFRAMES_DIR, 'throughput')
+    os.makedirs(output_dir, exist_ok=True)
+    header = ["Method"] + [f"{size}MB" for size in file_sizes]
+
+    tables = {}
+    handshake_rows = [header]
+    statistics_rows = [["Method", "File Size (MB)", "Operation", "Iterations", "Throughput (MB/s)",
+                        "CI Low (MB/s)", "CI High (MB/s)", "Median (ms)", "p95 (ms)", "p99 (ms)"]]
+    for (name, key_size), cell in results.items():
+        cipher = get_cipher(name)
+        encrypt_rows, decrypt_rows = tables.setdefault(cipher.family, ([header], [header]))
+        encrypt_rows.append([cipher.row_label(key_size, "Encryption")] + cell["encrypt"])
+        decrypt_rows.append([cipher.row_label(key_size, "Decryption")] + cell["decrypt"])
+        if cipher.handshake is not None:
+            handshake_rows.append([cipher.row_label(key_size, "Handshake")] + cell["handshake"])
+        for operation, label in (("encrypt", "Encryption"), ("decrypt", "Decryption")):
+            for index, file_size in enumerate(file_sizes):
+                statistics_rows.append([cipher.row_label(key_size, label), file_size, label,
+                                        cell["iterations"][index], cell[operation][index]]
+                                       + [cell[f"{operation}_{statistic}"][index] for statistic in STATISTICS])
+
+    for family, (encrypt_rows, decrypt_rows) in tables.items():
+        save_to_csv(os.path.join(output_dir, f'{family}_encryption_throughputs.csv'), encrypt_rows)
+        save_to_csv(os.path.join(output_dir, f'{family}_decryption_throughputs.csv'), decrypt_rows)
+    if len(handshake_rows) > 1:
+        save_to_csv(os.path.join(output_dir, 'handshake_latencies.csv'), handshake_rows)
+    save_to_csv(os.path.join(output_dir, 'timing_statistics.csv'), statistics_rows)
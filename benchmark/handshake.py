@@ -0,0 +1,90 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cryptography.hazmat.primitives.asymmetric import ec, x448, x25519
+
+from benchmark.ciphers import derive_shared_key, generate_ecc_key
+from benchmark.scheduler import init_worker, resolve_workers, wait_for_start
+from benchmark.stats import percentile
+
+CURVES = {
+    "P-256": ec.SECP256R1(),
+    "P-384": ec.SECP384R1(),
+    "P-521": ec.SECP521R1(),
+    "X25519": x25519.X25519PrivateKey,
+    "X448": x448.X448PrivateKey,
+}
+PEER_KEYS = 64  # Pre-generated client keys, reused round-robin
+WARMUP_HANDSHAKES = 20
+
+
+def time_handshakes(curve_name, count, key_size=32):
+    """Time count server-side handshakes on one curve.
+
+    A handshake is what a TLS-terminating server pays per connection: one
+    ephemeral key generation plus derive_shared_key (ECDH and HKDF) against a
+    client's public key. Client keys are generated up front, outside the
+    timings; in a pool started by run_handshakes() the loop then waits for
+    every worker to be ready. Returns (per-handshake latencies in seconds,
+    loop wall time).
+    """
+    curve = CURVES[curve_name]
+    peer_public_keys = [generate_ecc_key(curve).public_key() for i in range(PEER_KEYS)]
+
+    for i in range(WARMUP_HANDSHAKES):
+        derive_shared_key(generate_ecc_key(curve), peer_public_keys[i % PEER_KEYS], key_size)
+
+    wait_for_start()
+    latencies = []
+    loop_start = time.perf_counter()
+    for i in range(count):
+        start = time.perf_counter()
+        derive_shared_key(generate_ecc_key(curve), peer_public_keys[i % PEER_KEYS], key_size)
+        latencies.append(time.perf_counter() - start)
+    return latencies, time.perf_counter() - loop_start
+
+
+def run_handshakes(curve_names, count=5000, workers=None, pin=False, verbose=True):
+    """Measure handshakes per second and latency percentiles for each curve.
+
+    With workers, count handshakes are split across a process pool whose
+    workers start their loops together at a barrier, and ops/sec is all
+    handshakes over the longest worker loop. Returns a dict
+    mapping curve name to {"ops": ops/sec, "p50"/"p99": latency in ms,
+    "workers": worker count}.
+    """
+    results = {}
+    if workers:
+        workers, core_queue = resolve_workers(workers, pin)
+        workers = min(workers, count)  # Every worker needs a share to reach the barrier
+        barrier = multiprocessing.Barrier(workers)
+        pool = ProcessPoolExecutor(workers, initializer=init_worker, initargs=(core_queue, barrier))
+    else:
+        pool = None
+
+    try:
+        for curve_name in curve_names:
+            if pool is None:
+                runs = [time_handshakes(curve_name, count)]
+            else:
+                shares = [count // workers + (worker < count % workers) for worker in range(workers)]
+                futures = [pool.submit(time_handshakes, curve_name, share) for share in shares]
+                runs = [future.result() for future in futures]
+
+            latencies = [latency for run_latencies, _ in runs for latency in run_latencies]
+            results[curve_name] = {
+                "ops": len(latencies) / max(wall_time for _, wall_time in runs),
+                "p50": percentile(latencies, 50) * 1000,
+                "p99": percentile(latencies, 99) * 1000,
+                "workers": len(runs),
+            }
+            if verbose:
+                result = results[curve_name]
+                print(f"{curve_name}: {result['ops']:.0f} handshakes/s, p50 {result['p50']:.3f} ms, "
+                      f"p99 {result['p99']:.3f} ms ({result['workers']} workers)")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return results
@@ -0,0 +1,136 @@
+import functools
+import hashlib
+import json
+import os
+import platform
+import socket
+
+import cryptography
+import Crypto
+from cryptography.hazmat.backends.openssl.backend import backend as openssl_backend
+
+try:
+    from Crypto.Util import _cpu_features  # Private module, may be renamed in a later PyCryptodome
+except ImportError:
+    _cpu_features = None
+
+# /proc/cpuinfo flags that change cipher throughput
+CPU_FEATURES = ("aes", "pclmulqdq", "avx", "avx2", "avx512f", "vaes", "vpclmulqdq", "sha_ni")
+CPUINFO = "/proc/cpuinfo"
+GOVERNOR = "/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor"
+
+
+def library_versions():
+    return {"pycryptodome": Crypto.__version__, "cryptography": cryptography.__version__}
+
+
+def _read_cpuinfo():
+    """First processor's fields from /proc/cpuinfo; empty where the file does not exist (non-Linux)."""
+    fields = {}
+    try:
+        with open(CPUINFO) as f:
+            for line in f:
+                if not line.strip():
+                    break
+                name, _, value = line.partition(":")
+                fields[name.strip()] = value.strip()
+    except OSError:
+        pass
+    return fields
+
+
+def _read_governor():
+    try:
+        with open(GOVERNOR) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _aes_fallback(flags, pycryptodome_aes_ni):
+    """Why AES runs in software on this host, or None if it does not or that is unknown."""
+    if flags is None:
+        return None
+    if not flags["aes"]:
+        return "CPU does not report AES-NI: every AES cipher runs in software"
+    if pycryptodome_aes_ni is False:
+        return "CPU has AES-NI but PyCryptodome is not using it: AES runs its software fallback"
+    return None
+
+
+def _fallback_warnings(flags, pycryptodome_aes_ni):
+    fallback = _aes_fallback(flags, pycryptodome_aes_ni)
+    warnings = [fallback] if fallback is not None else []
+    if "OPENSSL_ia32cap" in os.environ:  # Informational: the mask may not clear anything
+        warnings.append(f"OPENSSL_ia32cap={os.environ['OPENSSL_ia32cap']} may mask CPU features from OpenSSL")
+    return warnings
+
+
+@functools.lru_cache(maxsize=None)
+def _fingerprint_json():
+    cpuinfo = _read_cpuinfo()
+    present = set(cpuinfo["flags"].split()) if "flags" in cpuinfo else None
+    flags = {feature: feature in present for feature in CPU_FEATURES} if present is not None else None
+    if _cpu_features is not None:
+        pycryptodome_aes_ni, pycryptodome_clmul = bool(_cpu_features.have_aes_ni()), bool(_cpu_features.have_clmul())
+    else:
+        pycryptodome_aes_ni = pycryptodome_clmul = "unknown"
+    fingerprint = {
+        "hostname": socket.gethostname(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_model": cpuinfo.get("model name") or platform.processor() or platform.machine(),
+        "cores": os.cpu_count(),
+        "available_cores": len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count(),
+        "governor": _read_governor(),
+        "flags": flags,  # None where the CPU flags cannot be read
+        "libraries": {**library_versions(), "openssl": openssl_backend.openssl_version_text()},
+        "pycryptodome_aes_ni": pycryptodome_aes_ni,
+        "pycryptodome_clmul": pycryptodome_clmul,
+        "warnings": _fallback_warnings(flags, pycryptodome_aes_ni),
+    }
+    return json.dumps(fingerprint, sort_keys=True)
+
+
+def host_fingerprint():
+    """Describe the machine a run is measured on.
+
+    Holds the CPU model, core counts, frequency governor, the CPU_FEATURES
+    flags, library and OpenSSL versions, whether PyCryptodome dispatches to
+    AES-NI/CLMUL ("unknown" if PyCryptodome does not say), and "warnings"
+    for runs where AES-NI is absent, a software fallback is in use or
+    OPENSSL_ia32cap is set. Read once per process; a fresh dict is returned.
+    """
+    return json.loads(_fingerprint_json())
+
+
+def fingerprint_id(fingerprint):
+    """Short stable hash of a fingerprint, to group results measured on identical hosts."""
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def has_aes_ni(fingerprint):
+    """True if the CPU reports AES-NI; None where the flags are unknown."""
+    return fingerprint["flags"]["aes"] if fingerprint["flags"] is not None else None
+
+
+def software_fallback(fingerprint):
+    """True if AES runs in software on the host, for lack of AES-NI or PyCryptodome not using it."""
+    return _aes_fallback(fingerprint["flags"], fingerprint["pycryptodome_aes_ni"]) is not None
+
+
+def report_fingerprint(fingerprint):
+    flags = fingerprint["flags"]
+    features = ", ".join(feature for feature in CPU_FEATURES if flags[feature]) if flags is not None else "unknown"
+    print(f"Host: {fingerprint['hostname']}, {fingerprint['cpu_model']}, {fingerprint['available_cores']}/"
+          f"{fingerprint['cores']} cores, governor {fingerprint['governor'] or 'unknown'}, "
+          f"{fingerprint['libraries']['openssl']}")
+    print(f"CPU features: {features or 'none'}")
+    for warning in fingerprint["warnings"]:
+        print(f"Warning: {warning}")
+
+
+def save_fingerprint(path, fingerprint=None):
+    """Write the fingerprint as JSON next to a result file, e.g. results.csv -> results.host.json."""
+    with open(os.path.splitext(path)[0] + ".host.json", 'w') as f:
+        json.dump(fingerprint or host_fingerprint(), f, indent=2, sort_keys=True)
@@ -0,0 +1,70 @@
+import mmap
+
+import psutil
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class MappedInput:
+    """A test file mapped into memory once and shared read-only by every cipher.
+
+    Slices are memoryviews onto the page cache, so passing them to the cipher
+    functions copies nothing and repeated iterations re-read no file data.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files cannot be mapped
+            self._map = None
+        self.view = memoryview(self._map if self._map is not None else b'')
+
+    def __len__(self):
+        return len(self.view)
+
+    def slice(self, start=0, stop=None):
+        return self.view[start:stop]
+
+    def advise_sequential(self):
+        """Hint that the mapping is read front to back, so the kernel reads ahead aggressively."""
+        if self._map is not None and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+
+    def release(self, start, stop):
+        """Drop the mapped pages of [start, stop) from this process's RSS; the page cache keeps them.
+
+        Later access faults them back in. start is rounded down to a page
+        boundary. A no-op where madvise(MADV_DONTNEED) is unavailable.
+        """
+        if self._map is not None and hasattr(mmap, 'MADV_DONTNEED'):
+            start -= start % mmap.PAGESIZE
+            self._map.madvise(mmap.MADV_DONTNEED, start, min(stop, len(self.view)) - start)
+
+    def close(self):
+        self.view.release()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def page_faults():
+    """Return this process's cumulative (minor, major) page fault counts.
+
+    psutil only exposes a combined fault count on Windows, so POSIX hosts read
+    the split counts from getrusage instead. Major faults required disk I/O and
+    indicate a cold page cache.
+    """
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_minflt, usage.ru_majflt
+    return psutil.Process().memory_info().num_page_faults, 0
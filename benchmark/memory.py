@@ -0,0 +1,149 @@
+import os
+import sys
+import threading
+import tracemalloc
+
+import psutil
+
+from benchmark.ciphers import get_cipher
+from benchmark.engine import DATAFRAMES_DIR, FILE_SIZES, check_mode, prepare_input, save_to_csv, warm_up
+from benchmark.streaming import DEFAULT_CHUNK_SIZE
+
+RSS_SAMPLE_INTERVAL = 0.001  # Seconds between RSS samples
+# Blocks allocated by the snapshots themselves and the RSS sampler thread,
+# left out of net_blocks so it only counts what the profiled call kept
+PROFILER_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, os.path.join(os.path.dirname(psutil.__file__), '*')),
+    tracemalloc.Filter(False, __file__),
+]
+
+
+class RssSampler:
+    """Record the peak RSS and allocated block count of this process while the with-block runs.
+
+    A background thread polls psutil and sys.getallocatedblocks(); cipher
+    calls release the GIL, so it keeps sampling while large buffers are being
+    encrypted.
+    """
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.baseline = 0
+        self.peak = 0
+        self.baseline_blocks = 0
+        self.peak_blocks = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            self.peak_blocks = max(self.peak_blocks, sys.getallocatedblocks())
+
+    def __enter__(self):
+        self.baseline = self.peak = self.process.memory_info().rss
+        self.baseline_blocks = self.peak_blocks = sys.getallocatedblocks()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+        self.peak_blocks = max(self.peak_blocks, sys.getallocatedblocks())
+
+    @property
+    def peak_delta(self):
+        return self.peak - self.baseline
+
+    @property
+    def peak_blocks_delta(self):
+        return self.peak_blocks - self.baseline_blocks
+
+
+def profile_call(function, input_bytes):
+    """Run function once under tracemalloc and the RSS sampler.
+
+    Neither tracemalloc nor the interpreter keeps a cumulative allocation
+    count, so the counts are of live blocks: "peak_blocks" is the most blocks
+    alive at once beyond those allocated before the call, as sampled by
+    RssSampler, and "net_blocks" the blocks the call allocated that are still
+    alive afterwards, not counting the profiler's own. "heap_to_input" is a
+    size ratio, the peak Python heap over the input size, i.e. how many
+    full-size buffers were alive at once. Sizes are in MB.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(PROFILER_FILTERS)
+        start_heap, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        with RssSampler() as sampler:
+            function()
+        _, peak_heap = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(PROFILER_FILTERS)
+    finally:
+        tracemalloc.stop()
+
+    peak_heap -= start_heap
+    return {
+        "peak_heap": peak_heap / (1024 * 1024),
+        "peak_rss_delta": sampler.peak_delta / (1024 * 1024),
+        "peak_blocks": sampler.peak_blocks_delta,
+        "heap_to_input": peak_heap / input_bytes if input_bytes else 0,
+        "net_blocks": sum(stat.count_diff for stat in after.compare_to(before, 'filename')),
+    }
+
+
+def profile_memory(cipher_names, file_sizes=FILE_SIZES, mode="read", chunk_size=DEFAULT_CHUNK_SIZE,
+                   verbose=True):
+    """Profile one encrypt/decrypt round trip per (cipher, key size, file size).
+
+    This pass runs separately from the timed benchmark because tracemalloc
+    slows down allocation-heavy code. Returns a dict mapping (cipher name, key
+    size) to per-file-size lists of the profile_call() fields.
+    """
+    ciphers = [get_cipher(name) for name in cipher_names]
+    check_mode(ciphers, mode)
+    warm_up(ciphers)
+
+    results = {
+        (cipher.name, key_size): {"peak_heap": [], "peak_rss_delta": [], "peak_blocks": [], "heap_to_input": [],
+                                  "net_blocks": []}
+        for cipher in ciphers for key_size in cipher.key_sizes
+    }
+    for file_size in file_sizes:
+        measure, close = prepare_input(file_size, mode, chunk_size)
+        try:
+            for cipher in ciphers:
+                for key_size in cipher.key_sizes:
+                    profile = profile_call(lambda: measure(cipher, key_size), file_size * 1024 * 1024)
+                    for field, value in profile.items():
+                        results[(cipher.name, key_size)][field].append(value)
+                    if verbose:
+                        print(f"File: test_{file_size}MB.txt, {cipher.row_label(key_size, 'Encryption')}: "
+                              f"Peak Heap: {profile['peak_heap']:.2f} MB "
+                              f"({profile['heap_to_input']:.2f}x input), "
+                              f"Peak RSS Delta: {profile['peak_rss_delta']:.2f} MB, "
+                              f"Peak Blocks: {profile['peak_blocks']}, Net Blocks: {profile['net_blocks']}")
+        finally:
+            close()
+            measure = None
+
+    return results
+
+
+def save_memory_profile(results, file_sizes=FILE_SIZES, mode="read", output_dir=None):
+    """Write memory_profile.csv next to the throughput CSVs."""
+    output_dir = output_dir or os.path.join(DATAFRAMES_DIR, 'throughput')
+    os.makedirs(output_dir, exist_ok=True)
+    rows = [["Method", "File Size (MB)", "Mode", "Peak Heap (MB)", "Peak RSS Delta (MB)", "Peak Heap / Input",
+             "Peak Blocks", "Net Blocks"]]
+    for (name, key_size), cell in results.items():
+        label = get_cipher(name).row_label(key_size, "Encryption")
+        for index, file_size in enumerate(file_sizes):
+            rows.append([label, file_size, mode, cell["peak_heap"][index], cell["peak_rss_delta"][index],
+                         cell["heap_to_input"][index], cell["peak_blocks"][index], cell["net_blocks"][index]])
+    save_to_csv(os.path.join(output_dir, 'memory_profile.csv'), rows)
@@ -0,0 +1,160 @@
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Crypto.Cipher import AES, ChaCha20
+from Crypto.Random import get_random_bytes
+
+from benchmark.ciphers import (BLOCK_SIZE, aes_decrypt_cbc, aes_decrypt_ecb, aes_encrypt_cbc, aes_encrypt_ecb,
+                               chacha20_encrypt, pkcs7_pad)
+from benchmark.timing import TimingConfig, collect, summarize
+
+CHACHA20_BLOCK_SIZE = 64
+
+
+@functools.lru_cache(maxsize=None)
+def get_executor(threads):
+    """Return a shared thread pool so pool start-up stays out of the timed region."""
+    return ThreadPoolExecutor(threads, thread_name_prefix=f"encrypt-{threads}")
+
+
+def chunk_bounds(length, threads, alignment=BLOCK_SIZE):
+    """Split length bytes into at most threads (start, stop) ranges starting on alignment boundaries."""
+    if length == 0:
+        return []
+    chunk = -(-length // threads)
+    chunk += -chunk % alignment
+    return [(start, min(start + chunk, length)) for start in range(0, length, chunk)]
+
+
+def run_chunks(new_cipher, operation, source, output, threads=None, alignment=BLOCK_SIZE):
+    """Apply operation ("encrypt" or "decrypt") to source in parallel, writing into output.
+
+    new_cipher(start) must return a cipher object positioned to process the
+    chunk beginning at byte offset start. PyCryptodome releases the GIL inside
+    the cipher call, so the chunks run concurrently on separate cores. With
+    threads=0 the whole input is one chunk processed on the calling thread,
+    the same kernel without the pool.
+    """
+    if threads is None:
+        threads = os.cpu_count() or 1
+    source = memoryview(source)
+    output = memoryview(output)
+
+    def process(bounds):
+        start, stop = bounds
+        getattr(new_cipher(start), operation)(source[start:stop], output=output[start:stop])
+
+    if threads == 0:
+        list(map(process, chunk_bounds(len(source), 1, alignment)))
+    else:
+        list(get_executor(threads).map(process, chunk_bounds(len(source), threads, alignment)))
+
+
+def strip_padding(output):
+    """Remove PKCS#7 padding from a bytearray in place."""
+    padding_length = output[-1]
+    if not 1 <= padding_length <= BLOCK_SIZE or output[-padding_length:] != bytes([padding_length]) * padding_length:
+        raise ValueError("Padding is incorrect.")
+    del output[-padding_length:]
+    return output
+
+
+# Parallel equivalents of the single-threaded helpers in benchmark.ciphers
+def parallel_encrypt_ecb(data, key, threads=None):
+    data = memoryview(data)
+    full = len(data) - len(data) % BLOCK_SIZE
+    output = bytearray(full + BLOCK_SIZE)
+    run_chunks(lambda start: AES.new(key, AES.MODE_ECB), "encrypt", data[:full], output, threads)
+    AES.new(key, AES.MODE_ECB).encrypt(pkcs7_pad(data[full:]), output=memoryview(output)[full:])
+    return output
+
+
+def parallel_decrypt_ecb(data, key, threads=None):
+    output = bytearray(len(data))
+    run_chunks(lambda start: AES.new(key, AES.MODE_ECB), "decrypt", data, output, threads)
+    return strip_padding(output)
+
+
+def parallel_decrypt_cbc(data, key, threads=None):
+    data = memoryview(data)
+    iv, encrypted_data = data[:BLOCK_SIZE], data[BLOCK_SIZE:]
+
+    # Each chunk's IV is the last ciphertext block of the chunk before it
+    def new_cipher(start):
+        chunk_iv = iv if start == 0 else encrypted_data[start - BLOCK_SIZE:start]
+        return AES.new(key, AES.MODE_CBC, chunk_iv)
+
+    output = bytearray(len(encrypted_data))
+    run_chunks(new_cipher, "decrypt", encrypted_data, output, threads)
+    return strip_padding(output)
+
+
+def parallel_crypt_ctr(data, key, nonce, threads=None):
+    """Encrypt or decrypt (the same operation) with AES-CTR and an 8-byte nonce."""
+    output = bytearray(len(data))
+    run_chunks(lambda start: AES.new(key, AES.MODE_CTR, nonce=nonce, initial_value=start // BLOCK_SIZE),
+               "encrypt", data, output, threads)
+    return output
+
+
+def parallel_chacha20(data, key, nonce, threads=None):
+    """Encrypt or decrypt (the same operation) with ChaCha20."""
+    def new_cipher(start):
+        cipher = ChaCha20.new(key=key, nonce=nonce)
+        cipher.seek(start)
+        return cipher
+
+    output = bytearray(len(data))
+    run_chunks(new_cipher, "encrypt", data, output, threads, CHACHA20_BLOCK_SIZE)
+    return output
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start,)
+
+
+def measure_thread_scaling(data, thread_counts, timing=TimingConfig(max_iterations=20), key_size=32):
+    """Measure the parallel helpers at each thread count against the same kernel run serially.
+
+    The baseline is the parallel helper with threads=0, i.e. writing into a
+    preallocated output on the calling thread, so the comparison isolates
+    threading rather than the single-threaded helpers' extra allocations
+    (those only check that the outputs match). Returns a dict mapping
+    operation name to {"baseline": MB/s, threads: MB/s} where throughput is
+    total bytes over total time across the iterations.
+    """
+    key = get_random_bytes(key_size)
+    nonce = get_random_bytes(8)
+    ecb_ciphertext = aes_encrypt_ecb(data, key)
+    cbc_ciphertext = aes_encrypt_cbc(data, key)
+
+    def ctr_baseline():
+        return AES.new(key, AES.MODE_CTR, nonce=nonce).encrypt(data)
+
+    operations = {
+        "AES ECB Encryption": (lambda: aes_encrypt_ecb(data, key),
+                               lambda threads: parallel_encrypt_ecb(data, key, threads)),
+        "AES ECB Decryption": (lambda: aes_decrypt_ecb(ecb_ciphertext, key),
+                               lambda threads: parallel_decrypt_ecb(ecb_ciphertext, key, threads)),
+        "AES CBC Decryption": (lambda: aes_decrypt_cbc(cbc_ciphertext, key),
+                               lambda threads: parallel_decrypt_cbc(cbc_ciphertext, key, threads)),
+        "AES CTR Encryption": (ctr_baseline,
+                               lambda threads: parallel_crypt_ctr(data, key, nonce, threads)),
+        "ChaCha20 Encryption": (lambda: chacha20_encrypt(data, key, nonce),
+                                lambda threads: parallel_chacha20(data, key, nonce, threads)),
+    }
+
+    megabytes = len(data) / (1024 * 1024)
+    results = {}
+    for name, (reference, parallel) in operations.items():
+        assert bytes(parallel(2)) == bytes(reference()), f"{name} parallel output does not match baseline!"
+        durations, = collect(lambda: timed(lambda: parallel(0)), timing)
+        results[name] = {"baseline": summarize(durations, megabytes)["throughput"]}
+        for threads in thread_counts:
+            durations, = collect(lambda: timed(lambda: parallel(threads)), timing)
+            results[name][threads] = summarize(durations, megabytes)["throughput"]
+    return results
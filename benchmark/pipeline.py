@@ -0,0 +1,326 @@
+import filecmp
+import os
+import queue
+import threading
+import time
+
+from Crypto.Cipher import AES, ChaCha20
+from Crypto.Random import get_random_bytes
+from Crypto.Util.Padding import unpad
+
+from benchmark.ciphers import BLOCK_SIZE, get_cipher
+from benchmark.engine import DATAFRAMES_DIR, save_to_csv, test_file_path
+from benchmark.streaming import DEFAULT_CHUNK_SIZE
+from benchmark.timing import TimingConfig, collect, summarize
+
+QUEUE_DEPTH = 4  # Buffers per pool, so at most this many chunks are in flight between two stages
+STAGES = ("wall", "read", "cipher", "write")
+DEFAULT_PIPELINE_TIMING = TimingConfig(warmup=1, min_iterations=3, max_iterations=10, target_rse=0.02)
+
+
+# Each factory returns (header, process) for one file. The header (IV or
+# nonce) is written before the first chunk, and process(source, length,
+# is_last, output) transforms source[:length] into output and returns the
+# output length. Chunks are one long CBC chain or keystream, so the output
+# file is exactly aes_encrypt_cbc(data, key) or nonce + chacha20_encrypt(data,
+# key, nonce) of the whole input. Buffers have BLOCK_SIZE spare bytes so the
+# last chunk is padded in place.
+def aes_cbc_file_encryptor(key):
+    iv = get_random_bytes(BLOCK_SIZE)
+    cipher = AES.new(key, AES.MODE_CBC, iv)
+
+    def process(source, length, is_last, output):
+        if is_last:
+            padding_length = BLOCK_SIZE - length % BLOCK_SIZE
+            source[length:length + padding_length] = bytes([padding_length]) * padding_length
+            length += padding_length
+        cipher.encrypt(source[:length], output=output[:length])
+        return length
+
+    return iv, process
+
+
+def aes_cbc_file_decryptor(key, iv):
+    cipher = AES.new(key, AES.MODE_CBC, iv)
+
+    def process(source, length, is_last, output):
+        cipher.decrypt(source[:length], output=output[:length])
+        if is_last:
+            if length < BLOCK_SIZE:
+                raise ValueError("Padded data is shorter than one block.")
+            # Validate the whole final block rather than only its last byte
+            length += len(unpad(bytes(output[length - BLOCK_SIZE:length]), BLOCK_SIZE)) - BLOCK_SIZE
+        return length
+
+    return process
+
+
+def chacha20_file_encryptor(key):
+    nonce = get_random_bytes(8)
+    cipher = ChaCha20.new(key=key, nonce=nonce)
+
+    def process(source, length, is_last, output):
+        cipher.encrypt(source[:length], output=output[:length])
+        return length
+
+    return nonce, process
+
+
+def chacha20_file_decryptor(key, nonce):
+    cipher = ChaCha20.new(key=key, nonce=nonce)
+
+    def process(source, length, is_last, output):
+        cipher.decrypt(source[:length], output=output[:length])
+        return length
+
+    return process
+
+
+# Cipher name: (encryptor factory, decryptor factory, header size)
+FILE_CIPHERS = {
+    "aes-cbc": (aes_cbc_file_encryptor, aes_cbc_file_decryptor, BLOCK_SIZE),
+    "chacha20": (chacha20_file_encryptor, chacha20_file_decryptor, 8),
+}
+
+
+class _Stopped(Exception):
+    """Raised inside a stage when another stage has failed."""
+
+
+class FilePipeline:
+    """Reader thread -> transform on the calling thread -> writer thread.
+
+    Stages hand chunks over through bounded queues of indices into two pools
+    of depth reusable buffers, one for input and one for output chunks, so
+    reading the next chunk and writing the previous one overlap with the
+    cipher work and memory stays at 2 * depth chunks whatever the file size.
+    File reads and writes and PyCryptodome calls release the GIL.
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, depth=QUEUE_DEPTH):
+        if chunk_size % BLOCK_SIZE:
+            raise ValueError(f"Chunk size must be a multiple of {BLOCK_SIZE}")
+        self.chunk_size = chunk_size
+        self.depth = depth
+        self.inputs = [bytearray(chunk_size + BLOCK_SIZE) for i in range(depth)]
+        self.outputs = [bytearray(chunk_size + BLOCK_SIZE) for i in range(depth)]
+
+    def _get(self, channel):
+        while True:
+            try:
+                return channel.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    raise _Stopped
+
+    def _put(self, channel, item):
+        while True:
+            try:
+                return channel.put(item, timeout=0.1)
+            except queue.Full:
+                if self._stop.is_set():
+                    raise _Stopped
+
+    def _run_stage(self, stage, *args):
+        try:
+            stage(*args)
+        except _Stopped:
+            pass
+        except BaseException as error:
+            self._errors.append(error)
+            self._stop.set()
+
+    def _read(self, source, offset, size, free_inputs, filled):
+        remaining = size - offset
+        source.seek(offset)
+        while True:
+            index = self._get(free_inputs)
+            view = memoryview(self.inputs[index])
+            start = time.perf_counter()
+            length = 0
+            wanted = min(self.chunk_size, remaining)
+            while length < wanted:
+                count = source.readinto(view[length:wanted])
+                if not count:
+                    raise EOFError(f"{source.name} shrank while being read")
+                length += count
+            self.times["read"] += time.perf_counter() - start
+            view.release()
+            remaining -= length
+            self._put(filled, (index, length, remaining == 0))
+            if remaining == 0:
+                return
+
+    def _transform(self, process, filled, free_inputs, transformed, free_outputs):
+        while True:
+            index, length, is_last = self._get(filled)
+            output_index = self._get(free_outputs)
+            with memoryview(self.inputs[index]) as source, memoryview(self.outputs[output_index]) as output:
+                start = time.perf_counter()
+                output_length = process(source, length, is_last, output)
+                self.times["cipher"] += time.perf_counter() - start
+            self._put(free_inputs, index)
+            self._put(transformed, (output_index, output_length))
+            if is_last:
+                self._put(transformed, None)
+                return
+
+    def _write(self, destination, header, transformed, free_outputs, sync):
+        start = time.perf_counter()
+        destination.write(header)
+        self.times["write"] += time.perf_counter() - start
+        while True:
+            item = self._get(transformed)
+            if item is None:
+                break
+            index, length = item
+            start = time.perf_counter()
+            with memoryview(self.outputs[index]) as view:
+                written = 0
+                while written < length:  # Unbuffered writes may be partial
+                    written += destination.write(view[written:length])
+            self.times["write"] += time.perf_counter() - start
+            self._put(free_outputs, index)
+        start = time.perf_counter()
+        destination.flush()
+        if sync:
+            os.fsync(destination.fileno())
+        self.times["write"] += time.perf_counter() - start
+
+    def run(self, source_path, destination_path, process, header=b'', skip=0, sync=True):
+        """Stream source_path (from byte skip) through process into destination_path after header.
+
+        Returns busy seconds per stage: "read" and "write" (including the
+        final fsync when sync is set) exclude time blocked on a queue,
+        "cipher" is time inside process, and "wall" is the whole run, so
+        the stage with the most busy time is the bottleneck.
+        """
+        self.times = dict.fromkeys(STAGES, 0.0)
+        self._stop = threading.Event()
+        self._errors = []
+        free_inputs = queue.Queue(self.depth)
+        free_outputs = queue.Queue(self.depth)
+        filled = queue.Queue(self.depth)
+        transformed = queue.Queue(self.depth)
+        for index in range(self.depth):
+            free_inputs.put(index)
+            free_outputs.put(index)
+
+        start = time.perf_counter()
+        with open(source_path, 'rb', buffering=0) as source, open(destination_path, 'wb', buffering=0) as destination:
+            size = os.fstat(source.fileno()).st_size
+            reader = threading.Thread(target=self._run_stage,
+                                      args=(self._read, source, skip, size, free_inputs, filled))
+            writer = threading.Thread(target=self._run_stage,
+                                      args=(self._write, destination, header, transformed, free_outputs, sync))
+            reader.start()
+            writer.start()
+            self._run_stage(self._transform, process, filled, free_inputs, transformed, free_outputs)
+            reader.join()
+            writer.join()
+        self.times["wall"] = time.perf_counter() - start
+
+        if self._errors:
+            raise self._errors[0]
+        return self.times
+
+
+def drop_page_cache(path):
+    """Ask the kernel to evict a file's clean pages so the next read comes from disk (Linux only)."""
+    if hasattr(os, 'posix_fadvise'):
+        with open(path, 'rb') as f:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def encrypt_file(source_path, destination_path, key, cipher_name="aes-cbc", pipeline=None, sync=True):
+    """Encrypt a file into destination_path; returns the pipeline's stage times."""
+    new_encryptor = FILE_CIPHERS[cipher_name][0]
+    header, process = new_encryptor(key)
+    return (pipeline or FilePipeline()).run(source_path, destination_path, process, header, sync=sync)
+
+
+def decrypt_file(source_path, destination_path, key, cipher_name="aes-cbc", pipeline=None, sync=True):
+    """Decrypt an encrypt_file() output into destination_path; returns the pipeline's stage times."""
+    new_decryptor, header_size = FILE_CIPHERS[cipher_name][1:]
+    with open(source_path, 'rb') as f:
+        header = f.read(header_size)
+    return (pipeline or FilePipeline()).run(source_path, destination_path, new_decryptor(key, header),
+                                            skip=header_size, sync=sync)
+
+
+def measure_file_pipeline(cipher_name, key_size, file_size, directory, chunk_size=DEFAULT_CHUNK_SIZE,
+                          depth=QUEUE_DEPTH, timing=DEFAULT_PIPELINE_TIMING, sync=True, cold=False):
+    """Encrypt then decrypt one test file through the pipeline, once per timing sample.
+
+    Returns {"encrypt": ..., "decrypt": ...}, each mapping every STAGES entry
+    to a summarize() dict, so "wall" is end-to-end MB/s and "cipher" is
+    pure cipher MB/s over the same chunks. With cold set the input's pages
+    are evicted before every run, so reads come from disk rather than the
+    page cache. The decrypted copy is compared with the input once, untimed.
+    """
+    source_path = test_file_path(file_size)
+    encrypted_path = os.path.join(directory, f"test_{file_size}MB.{cipher_name}.enc")
+    decrypted_path = os.path.join(directory, f"test_{file_size}MB.{cipher_name}.dec")
+    key = get_random_bytes(key_size)
+    pipeline = FilePipeline(chunk_size, depth)
+
+    def sample():
+        if cold:
+            drop_page_cache(source_path)
+        encryption = encrypt_file(source_path, encrypted_path, key, cipher_name, pipeline, sync)
+        encryption = tuple(encryption[stage] for stage in STAGES)
+        if cold:
+            drop_page_cache(encrypted_path)
+        decryption = decrypt_file(encrypted_path, decrypted_path, key, cipher_name, pipeline, sync)
+        return encryption + tuple(decryption[stage] for stage in STAGES)
+
+    try:
+        samples = collect(sample, timing)
+        assert filecmp.cmp(source_path, decrypted_path, shallow=False), "Decrypted file does not match original!"
+    finally:
+        for path in (encrypted_path, decrypted_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    summaries = [summarize(durations, file_size) for durations in samples]
+    return {"encrypt": dict(zip(STAGES, summaries[:len(STAGES)])),
+            "decrypt": dict(zip(STAGES, summaries[len(STAGES):]))}
+
+
+def bottleneck(stages):
+    """The busiest of the read, cipher and write stages."""
+    return min(("read", "cipher", "write"), key=lambda stage: stages[stage]["throughput"])
+
+
+def run_file_pipeline(cipher_names, file_sizes, directory, key_size=32, chunk_size=DEFAULT_CHUNK_SIZE,
+                      depth=QUEUE_DEPTH, timing=DEFAULT_PIPELINE_TIMING, sync=True, cold=False, verbose=True):
+    """Measure every (cipher, file size) pair; returns a dict keyed by (cipher name, file size)."""
+    os.makedirs(directory, exist_ok=True)
+    results = {}
+    for name in cipher_names:
+        label = get_cipher(name).row_label(key_size, "Encryption")
+        for file_size in file_sizes:
+            result = results[(name, file_size)] = measure_file_pipeline(name, key_size, file_size, directory,
+                                                                        chunk_size, depth, timing, sync, cold)
+            if verbose:
+                for operation, stages in result.items():
+                    print(f"File: test_{file_size}MB.txt, {label}, {operation.capitalize()}: "
+                          f"End-to-End {stages['wall']['throughput']:.2f} MB/s, "
+                          f"Cipher {stages['cipher']['throughput']:.2f} MB/s, "
+                          f"Read {stages['read']['throughput']:.2f} MB/s, "
+                          f"Write {stages['write']['throughput']:.2f} MB/s, "
+                          f"Bottleneck: {bottleneck(stages)}")
+    return results
+
+
+def save_file_pipeline(results, key_size=32, output=None):
+    output = output or os.path.join(DATAFRAMES_DIR, 'throughput', 'file_pipeline_throughputs.csv')
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    rows = [["Method", "File Size (MB)", "Operation", "End-to-End (MB/s)", "Cipher (MB/s)", "Read (MB/s)",
+             "Write (MB/s)", "Bottleneck"]]
+    for (name, file_size), result in results.items():
+        for operation, stages in result.items():
+            rows.append([get_cipher(name).row_label(key_size, "Encryption"), file_size, operation.capitalize()]
+                        + [stages[stage]["throughput"] for stage in ("wall", "cipher", "read", "write")]
+                        + [bottleneck(stages)])
+    save_to_csv(output, rows)
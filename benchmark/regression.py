@@ -0,0 +1,173 @@
+import json
+import os
+
+from benchmark.ciphers import get_cipher
+from benchmark.engine import DATAFRAMES_DIR, check_mode, prepare_input, run_cell, save_to_csv
+from benchmark.results import new_run_id, result_rows
+from benchmark.stats import mann_whitney_u, percentile
+from benchmark.timing import TimingConfig
+
+SUITE_DIR = os.path.join(DATAFRAMES_DIR, 'suite')
+BASELINES = "_baselines.json"  # Baseline name -> run id in the suite store; "_" keeps Parquet readers off it
+SUITE_TIMING = TimingConfig(warmup=2, min_iterations=10, max_iterations=30, target_rse=0.01)
+DEFAULT_THRESHOLD = 0.05  # Slowdowns smaller than this fraction are never reported
+DEFAULT_ALPHA = 0.01
+
+# Curated cells (cipher, key size in bytes, file size in MB, mode): one key size
+# per primitive, one small file for per-call overhead and streaming for the
+# chunked path. Runs in under a minute.
+SUITE = [
+    ("aes-cbc", 32, 10, "read"),
+    ("aes-ecb", 32, 10, "read"),
+    ("aes-ctr", 32, 10, "read"),
+    ("aes-gcm", 32, 10, "read"),
+    ("aes-ocb", 32, 10, "read"),
+    ("chacha20", 32, 10, "read"),
+    ("chacha20-poly1305", 32, 10, "read"),
+    ("rc4", 16, 10, "read"),
+    ("aes-cbc@cryptography", 32, 10, "read"),
+    ("aes-gcm@cryptography", 32, 10, "read"),
+    ("aes-cbc", 32, 1, "read"),
+    ("chacha20", 32, 1, "read"),
+    ("aes-cbc", 32, 10, "stream"),
+    ("aes-gcm", 32, 10, "stream"),
+]
+
+
+def run_suite(cells=SUITE, timing=SUITE_TIMING, verbose=True):
+    """Run the suite cells, preparing each (file size, mode) input once; returns {cell: run_cell() dict}."""
+    check_mode([get_cipher(name) for name, key_size, file_size, mode in cells if mode == "stream"], "stream")
+    results = {}
+    for file_size, mode in sorted({(file_size, mode) for name, key_size, file_size, mode in cells}):
+        measure, close = prepare_input(file_size, mode)
+        try:
+            for cell in cells:
+                name, key_size, cell_file_size, cell_mode = cell
+                if (cell_file_size, cell_mode) == (file_size, mode):
+                    results[cell] = run_cell(get_cipher(name), key_size, file_size, measure, timing, verbose)
+        finally:
+            close()
+    return results
+
+
+def suite_rows(results, run_id=None, fingerprint=None):
+    """Store rows for run_suite() results, all under one run id."""
+    run_id = run_id or new_run_id()
+    rows = []
+    for (name, key_size, file_size, mode), cell in results.items():
+        rows += result_rows({(name, key_size): {"samples": [cell["samples"]]}}, [file_size], mode, run_id,
+                            fingerprint)
+    return rows
+
+
+def load_baselines(path=SUITE_DIR):
+    try:
+        with open(os.path.join(path, BASELINES)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(name, run_id, path=SUITE_DIR):
+    baselines = load_baselines(path)
+    if name in baselines:
+        print(f"Baseline {name!r} moved from run {baselines[name]} to {run_id}")
+    baselines[name] = run_id
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, BASELINES), 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+
+
+def resolve_run(store, reference):
+    """Run id for a baseline name, a run id, or "latest" (the most recent run in the store)."""
+    run_ids = sorted(store.run_ids())
+    if reference == "latest":
+        if not run_ids:
+            raise ValueError(f"No runs in {store.path}")
+        return run_ids[-1]
+    run_id = load_baselines(store.path).get(reference, reference)
+    if run_id not in run_ids:
+        raise ValueError(f"{reference!r} is neither a baseline name nor a run id in {store.path}")
+    return run_id
+
+
+def host_changes(baseline, candidate):
+    """Describe fingerprint differences between two runs' samples that can explain a change in speed."""
+    def fingerprint(samples):
+        values = samples["fingerprint"].dropna()
+        return json.loads(values.iloc[0]) if len(values) else None
+
+    before, after = fingerprint(baseline), fingerprint(candidate)
+    if before is None or after is None:
+        return []
+    changes = []
+    for field in ("hostname", "cpu_model", "governor", "pycryptodome_aes_ni", "warnings"):
+        if before.get(field) != after.get(field):
+            changes.append(f"{field}: {before.get(field)} -> {after.get(field)}")
+    for library in sorted(set(before["libraries"]) | set(after["libraries"])):
+        if before["libraries"].get(library) != after["libraries"].get(library):
+            changes.append(f"{library}: {before['libraries'].get(library)} -> {after['libraries'].get(library)}")
+    if before.get("flags") != after.get("flags"):
+        changes.append(f"CPU flags: {before.get('flags')} -> {after.get('flags')}")
+    return changes
+
+
+def compare_runs(store, baseline_run, candidate_run, threshold=DEFAULT_THRESHOLD, alpha=DEFAULT_ALPHA):
+    """Compare per-iteration throughput of every cell the two runs share.
+
+    A cell is a "regression" (or "improvement") when its median throughput
+    moved by more than threshold and a two-sided Mann-Whitney U test rejects
+    "same distribution" at alpha; cells in only one run are "missing". Returns
+    (rows, host changes) where each row has the cell, "operation", the two
+    medians in MB/s, "change" as a fraction of the baseline, "p_value" and
+    "status".
+    """
+    samples = store.load(filters=[("run_id", "in", [baseline_run, candidate_run])])
+    baseline = samples[samples["run_id"] == baseline_run]
+    candidate = samples[samples["run_id"] == candidate_run]
+    cell_columns = ["algorithm", "method", "mode", "key_bits", "bytes"]
+    baseline_cells = dict(list(baseline.groupby(cell_columns)))
+    candidate_cells = dict(list(candidate.groupby(cell_columns)))
+
+    rows = []
+    for cell in sorted(set(baseline_cells) | set(candidate_cells)):
+        for operation, column in (("encrypt", "enc_ns"), ("decrypt", "dec_ns")):
+            row = dict(zip(cell_columns, cell), operation=operation, baseline=None, candidate=None, change=None,
+                       p_value=None, status="missing")
+            if cell in baseline_cells and cell in candidate_cells:
+                before = list(cell[-1] / (1024 * 1024) / (baseline_cells[cell][column] / 1e9))
+                after = list(cell[-1] / (1024 * 1024) / (candidate_cells[cell][column] / 1e9))
+                row["baseline"] = percentile(before, 50)
+                row["candidate"] = percentile(after, 50)
+                row["change"] = row["candidate"] / row["baseline"] - 1
+                row["p_value"] = mann_whitney_u(before, after)[1]
+                if row["p_value"] < alpha and abs(row["change"]) > threshold:
+                    row["status"] = "regression" if row["change"] < 0 else "improvement"
+                else:
+                    row["status"] = "unchanged"
+            rows.append(row)
+    return rows, host_changes(baseline, candidate)
+
+
+def print_comparison(rows, changes, baseline_run, candidate_run):
+    print(f"Baseline {baseline_run} vs candidate {candidate_run}")
+    for change in changes:
+        print(f"Host changed: {change}")
+    for row in rows:
+        cell = f"File: {row['bytes'] // (1024 * 1024)}MB ({row['mode']}), {row['method']} {row['operation']}"
+        if row["status"] == "missing":
+            print(f"{cell}: missing from one run")
+            continue
+        marker = {"regression": "REGRESSION", "improvement": "improvement"}.get(row["status"], "")
+        print(f"{cell}: {row['baseline']:.2f} -> {row['candidate']:.2f} MB/s ({row['change']:+.1%}, "
+              f"p={row['p_value']:.3g}) {marker}".rstrip())
+
+
+def save_comparison(rows, output):
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    table = [["Method", "Mode", "File Size (MB)", "Operation", "Baseline (MB/s)", "Candidate (MB/s)", "Change",
+              "p-value", "Status"]]
+    for row in rows:
+        table.append([row["method"], row["mode"], row["bytes"] // (1024 * 1024), row["operation"], row["baseline"],
+                      row["candidate"], row["change"], row["p_value"], row["status"]])
+    save_to_csv(output, table)
@@ -0,0 +1,105 @@
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from benchmark.ciphers import get_cipher
+from benchmark.engine import DATAFRAMES_DIR, FILE_SIZES
+from benchmark.host import fingerprint_id, has_aes_ni, host_fingerprint, software_fallback
+
+RESULTS_DIR = os.path.join(DATAFRAMES_DIR, 'results')
+
+SCHEMA = pa.schema([
+    ("run_id", pa.string()),
+    ("host", pa.string()),
+    ("algorithm", pa.string()),
+    ("method", pa.string()),  # Human-readable label, e.g. "AES-128 CBC"
+    ("mode", pa.string()),
+    ("key_bits", pa.int32()),
+    ("bytes", pa.int64()),
+    ("iteration", pa.int32()),
+    ("enc_ns", pa.int64()),
+    ("dec_ns", pa.int64()),
+    ("rss", pa.int64()),
+    ("host_id", pa.string()),  # fingerprint_id() of the host fingerprint
+    ("aes_ni", pa.bool_()),  # CPU reports AES-NI; null where unknown
+    ("software_fallback", pa.bool_()),  # AES runs in software: AES-NI absent or unused by PyCryptodome
+    ("fingerprint", pa.string()),  # Full host_fingerprint() as JSON
+])
+
+
+def new_run_id():
+    return f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+
+class ResultsStore:
+    """Append-only, long-format store of per-iteration benchmark samples.
+
+    Each append writes a new Parquet file into the store directory, so earlier
+    runs are never rewritten, and the directory reads back as one dataset:
+    pd.read_parquet(path, filters=[("algorithm", "==", "aes-cbc")]).
+    """
+
+    def __init__(self, path=RESULTS_DIR):
+        self.path = path
+
+    def append(self, rows):
+        """Write rows (dicts with the SCHEMA columns) as a new part file."""
+        if not rows:
+            return None
+        os.makedirs(self.path, exist_ok=True)
+        table = pa.Table.from_pylist(rows, schema=SCHEMA)
+        part = os.path.join(self.path, f"{rows[0]['run_id']}-{uuid.uuid4().hex[:8]}.parquet")
+        pq.write_table(table, part)
+        return part
+
+    def load(self, filters=None, columns=None):
+        """Read the store as a DataFrame, optionally filtered on any column.
+
+        filters uses the pyarrow syntax, e.g. [("mode", "==", "read"),
+        ("key_bits", "in", [128, 256])].
+        """
+        if not os.path.isdir(self.path) or not any(name.endswith('.parquet') for name in os.listdir(self.path)):
+            return pd.DataFrame({field.name: pd.Series(dtype=field.type.to_pandas_dtype()) for field in SCHEMA})
+        # Reading with SCHEMA fills columns added since older part files were written with nulls
+        return pd.read_parquet(self.path, filters=filters, columns=columns, schema=SCHEMA)
+
+    def run_ids(self):
+        return list(self.load(columns=["run_id"])["run_id"].unique())
+
+
+def result_rows(results, file_sizes=FILE_SIZES, mode="read", run_id=None, fingerprint=None):
+    """Flatten engine results with per-iteration "samples" into store rows tagged with the host fingerprint."""
+    run_id = run_id or new_run_id()
+    fingerprint = fingerprint or host_fingerprint()
+    host = {
+        "host": fingerprint["hostname"],
+        "host_id": fingerprint_id(fingerprint),
+        "aes_ni": has_aes_ni(fingerprint),
+        "software_fallback": software_fallback(fingerprint),
+        "fingerprint": json.dumps(fingerprint, sort_keys=True),
+    }
+    rows = []
+    for (name, key_size), cell in results.items():
+        method = get_cipher(name).row_label(key_size, "Encryption")
+        for file_size, samples in zip(file_sizes, cell["samples"]):
+            for iteration, (encryption_time, decryption_time, rss) in enumerate(samples):
+                rows.append({
+                    "run_id": run_id,
+                    **host,
+                    "algorithm": name,
+                    "method": method,
+                    "mode": mode,
+                    "key_bits": key_size * 8,
+                    "bytes": file_size * 1024 * 1024,
+                    "iteration": iteration,
+                    "enc_ns": round(encryption_time * 1e9),
+                    "dec_ns": round(decryption_time * 1e9),
+                    "rss": rss,
+                })
+    return rows
+
@@ -0,0 +1,165 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import psutil
+
+from benchmark.ciphers import get_cipher
+from benchmark.engine import (FILE_SIZES, add_cell, cached_cells, check_mode, empty_results, prepare_input,
+                              run_cell, warm_up)
+from benchmark.streaming import DEFAULT_CHUNK_SIZE
+from benchmark.timing import DEFAULT_TIMING, TimingConfig, collect
+
+BARRIER_TIMEOUT = 600  # Seconds to wait for every worker to finish its setup
+
+# Per-worker state set by init_worker()
+_barrier = None
+
+
+def available_cores():
+    """Return the sorted CPU ids this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def pin_to_core(core):
+    """Restrict the calling process to a single CPU."""
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {core})
+    else:  # Windows has no sched_setaffinity, psutil wraps SetProcessAffinityMask
+        psutil.Process().cpu_affinity([core])
+
+
+def init_worker(core_queue, barrier=None):
+    """Pool initializer: claim a dedicated core if pinning and keep the start barrier."""
+    global _barrier
+    _barrier = barrier
+    if core_queue is not None:
+        pin_to_core(core_queue.get())
+
+
+def wait_for_start():
+    """Block until every worker in the pool reaches this point; a no-op without a start barrier."""
+    if _barrier is not None:
+        _barrier.wait(BARRIER_TIMEOUT)
+
+
+def resolve_workers(workers, pin):
+    """Return (worker count, core queue or None) for a pool of the requested size.
+
+    With pin, every worker gets a core to itself, so the pool is capped at the
+    number of available cores.
+    """
+    cores = available_cores()
+    workers = workers or len(cores)
+    if not pin:
+        return workers, None
+    if workers > len(cores):
+        print(f"Only {len(cores)} cores available, running {len(cores)} pinned workers instead of {workers}")
+        workers = len(cores)
+    core_queue = multiprocessing.Queue()
+    for core in cores[:workers]:
+        core_queue.put(core)
+    return workers, core_queue
+
+
+def _cell_task(cipher_name, key_size, file_size, timing, mode, chunk_size):
+    cipher = get_cipher(cipher_name)
+    warm_up([cipher])
+    measure, close = prepare_input(file_size, mode, chunk_size)
+    try:
+        return run_cell(cipher, key_size, file_size, measure, timing, verbose=False)
+    finally:
+        close()
+
+
+def run_parallel(cipher_names, file_sizes=FILE_SIZES, timing=DEFAULT_TIMING, mode="read",
+                 chunk_size=DEFAULT_CHUNK_SIZE, workers=None, pin=False, verbose=True, cache=None):
+    """Run each (cipher, key size, file size) cell as its own task on a process pool.
+
+    Results have the same shape as engine.run_benchmark(). Every worker loads
+    its own copy of the input, so large read/zero-copy files need that much
+    memory per worker; use mode="stream" or "mmap" to keep it bounded. With a
+    cache, only uncached cells are submitted and each is checkpointed as it
+    completes.
+    """
+    ciphers = [get_cipher(name) for name in cipher_names]
+    check_mode(ciphers, mode)
+    workers, core_queue = resolve_workers(workers, pin)
+
+    cells = {}
+    keys = {}
+    for file_size in file_sizes:
+        cached, file_keys = cached_cells(cache, ciphers, file_size, mode, chunk_size, timing, verbose)
+        cells.update({(name, key_size, file_size): cell for (name, key_size), cell in cached.items()})
+        keys.update({(name, key_size, file_size): key for (name, key_size), key in file_keys.items()})
+
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(core_queue,)) as pool:
+        futures = {
+            (cipher.name, key_size, file_size): pool.submit(_cell_task, cipher.name, key_size, file_size,
+                                                            timing, mode, chunk_size)
+            for file_size in file_sizes for cipher in ciphers for key_size in cipher.key_sizes
+            if (cipher.name, key_size, file_size) not in cells
+        }
+        for (name, key_size, file_size), future in futures.items():
+            cells[(name, key_size, file_size)] = cell = future.result()
+            if cache is not None:
+                cache.put(keys[(name, key_size, file_size)], cell)
+            if verbose:
+                print(f"File: test_{file_size}MB.txt, {get_cipher(name).row_label(key_size, 'Encryption')}: "
+                      f"Encryption Throughput: {cell['encrypt']:.2f} MB/s, "
+                      f"Decryption Throughput: {cell['decrypt']:.2f} MB/s, {cell['iterations']} Iterations")
+
+    results = empty_results(ciphers)
+    for file_size in file_sizes:
+        for cipher in ciphers:
+            for key_size in cipher.key_sizes:
+                add_cell(results, cipher.name, key_size, cells[(cipher.name, key_size, file_size)])
+    return results
+
+
+def _aggregate_task(cipher_name, key_size, file_size, iterations, mode, chunk_size):
+    cipher = get_cipher(cipher_name)
+    warm_up([cipher])
+    measure, close = prepare_input(file_size, mode, chunk_size)
+    try:
+        wait_for_start()  # Start every worker's timed loop together
+        start = time.perf_counter()
+        encryption_times, decryption_times = collect(lambda: measure(cipher, key_size),
+                                                     TimingConfig.fixed(iterations))
+        return sum(encryption_times), sum(decryption_times), time.perf_counter() - start
+    finally:
+        close()
+
+
+def run_aggregate(cipher_name, key_size, file_size, workers=None, iterations=10, mode="read",
+                  chunk_size=DEFAULT_CHUNK_SIZE, pin=False):
+    """Measure total system throughput with workers encrypting the same cell at once.
+
+    All workers load their input, meet at a barrier and then run their timed
+    loops concurrently. Because the loops overlap, the system throughput is
+    the sum of the per-worker rates. Returns a dict with "workers",
+    "encrypt"/"decrypt" system MB/s, "per_worker_encrypt" MB/s and "wall_time"
+    seconds of the longest worker loop.
+    """
+    cipher = get_cipher(cipher_name)
+    check_mode([cipher], mode)
+    workers, core_queue = resolve_workers(workers, pin)
+    barrier = multiprocessing.Barrier(workers)
+
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(core_queue, barrier)) as pool:
+        futures = [pool.submit(_aggregate_task, cipher_name, key_size, file_size, iterations, mode, chunk_size)
+                   for worker in range(workers)]
+        timings = [future.result() for future in futures]
+
+    megabytes = file_size * iterations
+    per_worker_encrypt = [megabytes / encryption_time for encryption_time, _, _ in timings]
+    return {
+        "workers": workers,
+        "encrypt": sum(per_worker_encrypt),
+        "decrypt": sum(megabytes / decryption_time for _, decryption_time, _ in timings),
+        "per_worker_encrypt": per_worker_encrypt,
+        "wall_time": max(wall_time for _, _, wall_time in timings),
+    }
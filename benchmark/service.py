@@ -0,0 +1,309 @@
+import asyncio
+import multiprocessing
+import os
+import shutil
+import signal
+import socket
+import struct
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from Crypto.Random import get_random_bytes
+
+from benchmark.ciphers import (aes_encrypt_cbc, aes_encrypt_gcm, chacha20_encrypt, chacha20_poly1305_encrypt,
+                               get_cipher)
+from benchmark.engine import DATAFRAMES_DIR, save_to_csv
+from benchmark.stats import percentile
+
+REQUEST = struct.Struct("!IBI")  # Request id, cipher index, payload length
+RESPONSE = struct.Struct("!IBIQQ")  # Request id, status, body length, queueing delay ns, service time ns
+STATUS_OK, STATUS_ERROR = 0, 1  # An error response's body is the UTF-8 error message
+EXECUTORS = ("thread", "process", "inline")
+TRANSPORTS = ("tcp", "unix")
+PAYLOAD_SIZES = [1024, 16384, 262144]  # Bytes
+WARMUP_REQUESTS = 50
+REQUEST_TIMEOUT = 10  # Seconds after its scheduled send time before a request counts as timed out
+KEY_SIZE = 32
+
+
+def chacha20_encrypt_message(data, key):
+    nonce = get_random_bytes(12)
+    return nonce + chacha20_encrypt(data, key, nonce)
+
+
+# The request's cipher index is its position in this dict
+SERVICE_CIPHERS = {
+    "aes-cbc": aes_encrypt_cbc,
+    "chacha20": chacha20_encrypt_message,
+    "aes-gcm": aes_encrypt_gcm,
+    "chacha20-poly1305": chacha20_poly1305_encrypt,
+}
+CIPHER_NAMES = list(SERVICE_CIPHERS)
+
+
+def _timed_encrypt(cipher_index, payload, key, received):
+    """Run one request in a pool worker; returns (ciphertext, queueing delay ns, service time ns).
+
+    time.monotonic_ns() is system-wide on Linux, so the delay since the
+    event loop received the request is meaningful across processes too.
+    """
+    start = time.monotonic_ns()
+    ciphertext = SERVICE_CIPHERS[CIPHER_NAMES[cipher_index]](payload, key)
+    return ciphertext, start - received, time.monotonic_ns() - start
+
+
+class EncryptionServer:
+    """asyncio server encrypting length-prefixed requests with the SERVICE_CIPHERS.
+
+    A connection may pipeline any number of requests; each is answered, in
+    completion order, with its request id. The event loop only frames bytes:
+    encryption runs on a thread pool, a process pool (payloads are pickled
+    across) or, with "inline", on the loop itself. Every response carries the
+    time the request waited for a worker and the time spent encrypting; a
+    request that fails gets an error response rather than none.
+    """
+
+    def __init__(self, executor="thread", workers=None, key=None):
+        self.key = key or get_random_bytes(KEY_SIZE)
+        self.executor = executor
+        if executor == "thread":
+            self.pool = ThreadPoolExecutor(workers)
+        elif executor == "process":
+            self.pool = ProcessPoolExecutor(workers)
+        else:
+            self.pool = None
+
+    async def _respond(self, writer, request_id, cipher_index, payload, received):
+        try:
+            if self.pool is None:
+                body, delay, service = _timed_encrypt(cipher_index, payload, self.key, received)
+            else:
+                body, delay, service = await asyncio.get_running_loop().run_in_executor(
+                    self.pool, _timed_encrypt, cipher_index, payload, self.key, received)
+            status = STATUS_OK
+        except Exception as error:
+            body, delay, service, status = repr(error).encode(), 0, 0, STATUS_ERROR
+        writer.write(RESPONSE.pack(request_id, status, len(body), delay, service) + body)
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(REQUEST.size)
+                except asyncio.IncompleteReadError:
+                    break
+                request_id, cipher_index, length = REQUEST.unpack(header)
+                try:
+                    payload = await reader.readexactly(length)
+                except asyncio.IncompleteReadError:
+                    break
+                task = asyncio.create_task(self._respond(writer, request_id, cipher_index, payload,
+                                                         time.monotonic_ns()))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=0, path=None):
+        """Listen on a Unix socket at path, or on TCP host:port; returns the asyncio server."""
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+def serve(executor="thread", workers=None, host="127.0.0.1", port=0, path=None, ready=None):
+    """Run an EncryptionServer until interrupted, sending its address to the ready queue once listening."""
+    async def main():
+        server = EncryptionServer(executor, workers)
+        try:
+            listener = await server.start(host, port, path)
+            address = path if path is not None else listener.sockets[0].getsockname()[:2]
+            if ready is not None:
+                ready.put(address)
+            else:
+                print(f"Listening on {address} with a {executor} executor")
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            server.close()
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+class LoadGenerator:
+    """Open-loop client: sends requests on a fixed schedule whether or not earlier ones finished.
+
+    Requests are spread round-robin over a few pipelined connections. Latency
+    runs from each request's scheduled send time, not the actual one, so a
+    client falling behind still counts against the server (no coordinated
+    omission). Requests answered with an error, or not answered within
+    timeout seconds of their scheduled time, are counted instead of sampled.
+    """
+
+    def __init__(self, address, connections=8, timeout=REQUEST_TIMEOUT):
+        self.address = address
+        self.connections = connections
+        self.timeout = timeout
+
+    async def _connect(self):
+        if isinstance(self.address, str):
+            reader, writer = await asyncio.open_unix_connection(self.address)
+        else:
+            reader, writer = await asyncio.open_connection(*self.address)
+            writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return reader, writer
+
+    async def _receive(self, reader, pending):
+        while True:
+            try:
+                header = await reader.readexactly(RESPONSE.size)
+            except asyncio.IncompleteReadError:
+                return
+            request_id, status, length, delay, service = RESPONSE.unpack(header)
+            try:
+                await reader.readexactly(length)
+            except asyncio.IncompleteReadError:
+                return
+            future = pending.pop(request_id, None)
+            if future is not None and not future.done():  # Done once its deadline has passed
+                future.set_result((status, time.perf_counter(), delay / 1e9, service / 1e9))
+
+    async def run(self, cipher_name, payload, rate, count):
+        """Send count requests at rate per second.
+
+        Returns ([(latency, queueing delay, service time)] in seconds per
+        successful request, the number of requests that failed, the number
+        that timed out, wall time from the first send to the last response).
+        """
+        cipher_index = CIPHER_NAMES.index(cipher_name)
+        loop = asyncio.get_running_loop()
+        connections = [await self._connect() for i in range(self.connections)]
+        pending = {}
+        receivers = [asyncio.create_task(self._receive(reader, pending)) for reader, writer in connections]
+        requests = []
+        errors = timeouts = 0
+        try:
+            start = time.perf_counter()
+            for request_id in range(count):
+                scheduled = start + request_id / rate
+                if scheduled > time.perf_counter():
+                    await asyncio.sleep(scheduled - time.perf_counter())
+                future = pending[request_id] = loop.create_future()
+                writer = connections[request_id % len(connections)][1]
+                try:
+                    if writer.is_closing():  # The server went away
+                        raise ConnectionResetError
+                    writer.write(REQUEST.pack(request_id, cipher_index, len(payload)) + payload)
+                    await writer.drain()
+                except ConnectionError:
+                    del pending[request_id]
+                    errors += 1
+                    continue
+                requests.append((scheduled, future))
+            samples = []
+            for scheduled, future in requests:
+                try:
+                    status, finished, delay, service = await asyncio.wait_for(
+                        future, max(scheduled + self.timeout - time.perf_counter(), 0))
+                except asyncio.TimeoutError:
+                    timeouts += 1
+                    continue
+                if status != STATUS_OK:
+                    errors += 1
+                    continue
+                samples.append((finished - scheduled, delay, service))
+            return samples, errors, timeouts, time.perf_counter() - start
+        finally:
+            for reader, writer in connections:
+                writer.close()
+            for receiver in receivers:
+                receiver.cancel()
+
+
+def summarize_requests(samples, errors, timeouts, wall_time, payload_size):
+    latencies, delays, services = zip(*samples) if samples else ([float('nan')],) * 3
+    return {
+        "errors": errors,
+        "timeouts": timeouts,
+        "requests": len(samples) / wall_time,
+        "throughput": len(samples) * payload_size / (1024 * 1024) / wall_time,
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "queue_p50": percentile(delays, 50) * 1000,
+        "queue_p99": percentile(delays, 99) * 1000,
+        "service_p50": percentile(services, 50) * 1000,
+    }
+
+
+def run_service(cipher_names, payload_sizes=PAYLOAD_SIZES, rate=500, duration=5, connections=8, executor="thread",
+                workers=None, transport="tcp", timeout=REQUEST_TIMEOUT, verbose=True):
+    """Start a server in a child process and drive every (cipher, payload size) at a fixed request rate.
+
+    The server runs in its own process so it does not share an interpreter
+    with the load generator. Returns a dict mapping (cipher name, payload
+    size) to summarize_requests() results: failed "errors" and timed out
+    "timeouts" request counts, then, over the successful requests, achieved
+    "requests"/s and MB/s, latency "p50"/"p95"/"p99", queueing delay
+    "queue_p50"/"queue_p99" and "service_p50", all in ms.
+    """
+    path = os.path.join(tempfile.mkdtemp(), "encryption.sock") if transport == "unix" else None
+    ready = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, kwargs=dict(executor=executor, workers=workers, path=path,
+                                                               ready=ready))
+    server.start()
+    try:
+        address = ready.get(timeout=30)
+        address = tuple(address) if path is None else address
+        generator = LoadGenerator(address, connections, timeout)
+        results = {}
+        for name in cipher_names:
+            label = get_cipher(name).row_label(KEY_SIZE, "Encryption")
+            for size in payload_sizes:
+                payload = os.urandom(size)
+                asyncio.run(generator.run(name, payload, rate, WARMUP_REQUESTS))
+                samples, errors, timeouts, wall_time = asyncio.run(
+                    generator.run(name, payload, rate, max(int(rate * duration), 1)))
+                result = results[(name, size)] = summarize_requests(samples, errors, timeouts, wall_time, size)
+                if verbose:
+                    print(f"{label}, {size} B at {rate} req/s: {result['requests']:.0f} req/s, "
+                          f"{result['throughput']:.2f} MB/s, p50/p95/p99 {result['p50']:.3f}/{result['p95']:.3f}/"
+                          f"{result['p99']:.3f} ms, Queueing p50/p99 {result['queue_p50']:.3f}/"
+                          f"{result['queue_p99']:.3f} ms, Service p50 {result['service_p50']:.3f} ms, "
+                          f"Errors {result['errors']}, Timeouts {result['timeouts']}")
+        return results
+    finally:
+        # SIGINT rather than terminate() so the server shuts its pool down instead of orphaning the workers
+        os.kill(server.pid, signal.SIGINT)
+        server.join(10)
+        if server.is_alive():
+            server.terminate()
+            server.join()
+        if path is not None:
+            shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+
+
+def save_service(results, rate, executor, output=None):
+    output = output or os.path.join(DATAFRAMES_DIR, 'throughput', 'service_latencies.csv')
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    rows = [["Method", "Payload Size (B)", "Offered (req/s)", "Executor", "Achieved (req/s)", "MB/s", "p50 (ms)",
+             "p95 (ms)", "p99 (ms)", "Queueing p50 (ms)", "Queueing p99 (ms)", "Service p50 (ms)", "Errors",
+             "Timeouts"]]
+    for (name, size), result in results.items():
+        rows.append([get_cipher(name).row_label(KEY_SIZE, "Encryption"), size, rate, executor]
+                    + [result[field] for field in ("requests", "throughput", "p50", "p95", "p99", "queue_p50",
+                                                   "queue_p99", "service_p50", "errors", "timeouts")])
+    save_to_csv(output, rows)
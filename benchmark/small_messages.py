@@ -0,0 +1,161 @@
+import itertools
+import os
+import time
+
+from Crypto.Cipher import AES, ARC4, ChaCha20
+from Crypto.Random import get_random_bytes
+
+from benchmark.batch import aes_encrypt_cbc_batch, chacha20_encrypt_batch, pack_messages
+from benchmark.ciphers import (BLOCK_SIZE, AesCbcContext, ChaCha20Context, CipherContextCache, CounterNonces,
+                               RandomPool, aes_encrypt_cbc, chacha20_encrypt, get_cipher, pkcs7_pad, rc4_encrypt)
+from benchmark.engine import DATAFRAMES_DIR, save_to_csv
+from benchmark.stats import percentile
+from benchmark.timing import TimingConfig, collect
+
+MESSAGE_SIZES = [16, 64, 256, 1024, 4096, 16384, 65536]  # Bytes
+CALLS_PER_SAMPLE = 2000
+BATCH_MESSAGES = 256  # Messages per batch API call
+OVERHEADS = ("construct", "iv", "pad")  # Per-call costs split out of the full encrypt call
+DEFAULT_MESSAGE_TIMING = TimingConfig(warmup=1, min_iterations=5, max_iterations=30, target_rse=0.02)
+
+
+# Each function returns zero-argument calls for one message: "total" is the
+# full per-message encrypt as production calls it, the rest time its parts
+# in isolation, "reused" is the same message through a cached cipher
+# context looked up by key id and "batch" encrypts BATCH_MESSAGES copies in
+# one batch API call. "pooled" is "total" with the IV/nonce taken from a
+# RandomPool or CounterNonces, and "iv_pooled" that IV/nonce step alone.
+# Parts a cipher does not have are left out.
+def aes_cbc_calls(message, key):
+    iv = get_random_bytes(BLOCK_SIZE)
+    padded = pkcs7_pad(message)
+    cipher = AES.new(key, AES.MODE_CBC, iv)
+    contexts = CipherContextCache(AesCbcContext)
+    buffer, offsets = pack_messages([message] * BATCH_MESSAGES)
+    pool = RandomPool()
+    return {
+        "total": lambda: aes_encrypt_cbc(message, key),
+        "construct": lambda: AES.new(key, AES.MODE_CBC, iv),
+        "iv": lambda: get_random_bytes(BLOCK_SIZE),
+        "iv_pooled": lambda: pool.take(BLOCK_SIZE),
+        "pooled": lambda: aes_encrypt_cbc(message, key, pool.take(BLOCK_SIZE)),
+        "pad": lambda: pkcs7_pad(message),
+        "encrypt": lambda: cipher.encrypt(padded),
+        "reused": lambda: contexts.get("key-0", key).encrypt(message),
+        "batch": lambda: aes_encrypt_cbc_batch(buffer, offsets, key),
+    }
+
+
+def chacha20_calls(message, key):
+    nonce = get_random_bytes(8)
+    cipher = ChaCha20.new(key=key, nonce=nonce)
+    contexts = CipherContextCache(ChaCha20Context)
+    message_numbers = itertools.count()
+    buffer, offsets = pack_messages([message] * BATCH_MESSAGES)
+    nonces = CounterNonces(size=8)
+    return {
+        # A fresh nonce per message, as any real caller of chacha20_encrypt needs
+        "total": lambda: chacha20_encrypt(message, key, get_random_bytes(8)),
+        "construct": lambda: ChaCha20.new(key=key, nonce=nonce),
+        "iv": lambda: get_random_bytes(8),
+        "iv_pooled": nonces.next,
+        "pooled": lambda: chacha20_encrypt(message, key, nonces.next()),
+        "encrypt": lambda: cipher.encrypt(message),
+        "reused": lambda: contexts.get("key-0", key).encrypt(message, next(message_numbers)),
+        "batch": lambda: chacha20_encrypt_batch(buffer, offsets, key),
+    }
+
+
+def rc4_calls(message, key):
+    cipher = ARC4.new(key)
+    return {
+        "total": lambda: rc4_encrypt(message, key),
+        "construct": lambda: ARC4.new(key),
+        "encrypt": lambda: cipher.encrypt(message),
+    }
+
+
+SMALL_MESSAGE_CALLS = {
+    "aes-cbc": aes_cbc_calls,
+    "chacha20": chacha20_calls,
+    "rc4": rc4_calls,
+}
+
+
+def time_per_call(function, count):
+    """Average seconds per call over count back-to-back calls."""
+    start = time.perf_counter_ns()
+    for i in range(count):
+        function()
+    return (time.perf_counter_ns() - start) / count / 1e9
+
+
+def measure_message(calls, count=CALLS_PER_SAMPLE, timing=DEFAULT_MESSAGE_TIMING):
+    """Median ns per message of every call in calls, one sample being count back-to-back messages.
+
+    The loop and lambda overhead (tens of ns) is included in every part, so
+    the parts do not quite add up to "total"; "other" is what remains. The
+    "batch" call covers BATCH_MESSAGES messages, so it runs that many times
+    fewer.
+    """
+    names = list(calls)
+    messages = {name: BATCH_MESSAGES if name == "batch" else 1 for name in names}
+
+    def sample():
+        return tuple(time_per_call(calls[name], max(count // messages[name], 1)) / messages[name]
+                     for name in names)
+
+    samples = collect(sample, timing)
+    result = {name: percentile(metric, 50) * 1e9 for name, metric in zip(names, samples)}
+    result["ops"] = 1e9 / result["total"]
+    result["other"] = result["total"] - sum(result.get(name, 0) for name in OVERHEADS + ("encrypt",))
+    for variant in ("reused", "batch", "pooled"):
+        if variant in result:
+            result[f"{variant}_ops"] = 1e9 / result[variant]
+    return result
+
+
+def run_small_messages(cipher_names, message_sizes=MESSAGE_SIZES, key_size=32, count=CALLS_PER_SAMPLE,
+                       timing=DEFAULT_MESSAGE_TIMING, verbose=True):
+    """Measure per-message latency of the construct-per-call helpers across message sizes.
+
+    Returns a dict mapping (cipher name, message size) to the measure_message()
+    fields: "ops" per second and "total"/"construct"/"iv"/"pad"/"encrypt"/"other"
+    in ns per message, plus "reused"/"batch"/"pooled" ns and the matching
+    "*_ops" per second for ciphers with a reusable context, a batch API and
+    pooled IVs/nonces, and "iv_pooled" ns for the pooled IV/nonce alone.
+    """
+    results = {}
+    for name in cipher_names:
+        label = get_cipher(name).row_label(key_size, "Encryption")
+        key = get_random_bytes(key_size)
+        for size in message_sizes:
+            result = results[(name, size)] = measure_message(SMALL_MESSAGE_CALLS[name](os.urandom(size), key),
+                                                             count, timing)
+            if verbose:
+                parts = ", ".join(f"{part} {result[part]:.0f}" for part in OVERHEADS + ("encrypt", "other")
+                                  if part in result)
+                print(f"{label}, {size} B: {result['ops']:.0f} ops/s, {result['total']:.0f} ns/op ({parts} ns)")
+                if "pooled" in result:
+                    print(f"{label}, {size} B, Pooled IV/Nonce: {result['pooled_ops']:.0f} ops/s, "
+                          f"{result['pooled']:.0f} ns/op (IV/nonce {result['iv']:.0f} -> "
+                          f"{result['iv_pooled']:.0f} ns)")
+                for variant, variant_label in (("reused", "Reused Context"), ("batch", "Batch")):
+                    if variant in result:
+                        print(f"{label}, {size} B, {variant_label}: {result[f'{variant}_ops']:.0f} ops/s, "
+                              f"{result[variant]:.0f} ns/op ({result['total'] / result[variant]:.2f}x)")
+    return results
+
+
+def save_small_messages(results, key_size=32, output=None):
+    output = output or os.path.join(DATAFRAMES_DIR, 'throughput', 'small_message_latencies.csv')
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    rows = [["Method", "Message Size (B)", "Ops/s", "ns/op", "Construct (ns)", "IV/Nonce (ns)", "Padding (ns)",
+             "Encrypt (ns)", "Other (ns)", "Reused Ops/s", "Reused ns/op", "Batch Ops/s", "Batch ns/op",
+             "Pooled IV/Nonce (ns)", "Pooled Ops/s", "Pooled ns/op"]]
+    for (name, size), result in results.items():
+        rows.append([get_cipher(name).row_label(key_size, "Encryption"), size, result["ops"], result["total"]]
+                    + [result.get(part, 0) for part in OVERHEADS + ("encrypt", "other")]
+                    + [result.get("reused_ops"), result.get("reused"), result.get("batch_ops"), result.get("batch")]
+                    + [result.get("iv_pooled"), result.get("pooled_ops"), result.get("pooled")])
+    save_to_csv(output, rows)
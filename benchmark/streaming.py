@@ -0,0 +1,79 @@
+import time
+
+from Crypto.Util.Padding import unpad
+
+from benchmark.ciphers import BLOCK_SIZE, pkcs7_pad
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the file at path in chunk_size pieces without reading it whole."""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def mark_last(chunks):
+    """Yield (chunk, is_last) pairs. An empty input yields a single empty final chunk."""
+    chunks = iter(chunks)
+    previous = next(chunks, b'')
+    for chunk in chunks:
+        yield previous, False
+        previous = chunk
+    yield previous, True
+
+
+def measure_stream(cipher, chunks, key_size, verify_times=None):
+    """Encrypt then decrypt each chunk with one long-lived cipher object pair.
+
+    Only the final chunk is padded, so peak memory is a few chunks regardless
+    of input size. Reading the chunks is not timed, matching the one-shot path
+    which times encryption of data already in memory. AEAD tag generation and
+    verification are timed with the last chunk. If verify_times is a list,
+    the seconds spent checking each round trip are appended to it so callers
+    timing the whole pass can leave them out.
+    """
+    if cipher.new_stream is None:
+        raise ValueError(f"{cipher.name} has no streaming implementation")
+
+    encryptor, decryptor = cipher.new_stream(key_size)
+    encryption_time = 0
+    decryption_time = 0
+
+    for chunk, is_last in mark_last(chunks):
+        if cipher.padded and not is_last and len(chunk) % BLOCK_SIZE:
+            raise ValueError(f"Chunk size must be a multiple of {BLOCK_SIZE} for {cipher.name}")
+
+        # Encryption
+        start = time.perf_counter()
+        plaintext = pkcs7_pad(chunk) if cipher.padded and is_last else chunk
+        encrypted_chunk = encryptor.encrypt(plaintext)
+        encryption_time += time.perf_counter() - start
+
+        # Decryption
+        start = time.perf_counter()
+        decrypted_chunk = decryptor.decrypt(encrypted_chunk)
+        if cipher.padded and is_last:
+            decrypted_chunk = unpad(decrypted_chunk, BLOCK_SIZE)
+        decryption_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        # bytes() so mmap memoryviews compare with memcmp rather than item by item
+        assert decrypted_chunk == bytes(chunk), "Decrypted data does not match original!"
+        if verify_times is not None:
+            verify_times.append(time.perf_counter() - start)
+
+    if cipher.authenticated:
+        start = time.perf_counter()
+        tag = encryptor.digest()
+        encryption_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        decryptor.verify(tag)
+        decryption_time += time.perf_counter() - start
+
+    return encryption_time, decryption_time
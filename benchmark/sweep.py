@@ -0,0 +1,155 @@
+import os
+import shutil
+import time
+
+import psutil
+
+from benchmark.ciphers import get_cipher
+from benchmark.engine import DATAFRAMES_DIR, TEST_FILES_DIR, save_to_csv, test_file_path
+from benchmark.inputs import MappedInput, page_faults
+from benchmark.memory import RssSampler
+from benchmark.pipeline import drop_page_cache
+from benchmark.streaming import DEFAULT_CHUNK_SIZE, iter_chunks, measure_stream
+from test_files.file_creator import create_files
+
+SWEEP_SIZES = [1024, 4096, 16384, 65536]  # MB: 1GB, 4GB, 16GB, 64GB
+SWEEP_MODES = ("stream", "mmap")
+SWEEP_CIPHERS = ["aes-cbc", "aes-ctr", "chacha20", "aes-gcm"]
+SWEEP_RSS_INTERVAL = 0.05  # Seconds between RSS samples; runs last minutes
+
+
+def iter_mapped_chunks(mapped, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield chunk_size memoryviews of a MappedInput, dropping each from RSS as the one after next is requested.
+
+    File-backed pages count towards RSS while mapped, so without the release
+    a full pass over a 64GB mapping would report the whole file as resident.
+    Releasing lags a chunk because mark_last() reads one chunk ahead; pages
+    released while still in use would simply be faulted back in.
+    """
+    mapped.advise_sequential()
+    for start in range(0, len(mapped), chunk_size):
+        yield mapped.slice(start, start + chunk_size)
+        if start >= chunk_size:
+            mapped.release(start - chunk_size, start)
+
+
+def io_wait_seconds():
+    """System-wide seconds CPUs spent idle with I/O outstanding; 0 where psutil does not report it."""
+    return getattr(psutil.cpu_times(), 'iowait', 0.0)
+
+
+def read_bytes():
+    try:
+        return psutil.Process().io_counters().read_bytes
+    except (AttributeError, psutil.AccessDenied):  # No per-process I/O counters on this platform
+        return 0
+
+
+def measure_large_file(cipher, key_size, file_size, mode="stream", chunk_size=DEFAULT_CHUNK_SIZE, cold=False):
+    """Stream one encrypt/decrypt pass over a large test file, watching memory and I/O.
+
+    Returns a dict with "encrypt"/"decrypt" cipher-only and "wall" end-to-end
+    MB/s (wall includes reading the input but not checking the round trip),
+    "peak_rss" and its growth over the starting RSS "rss_growth" in MB,
+    "io_wait" as system iowait seconds per elapsed second (near 1.0 means a
+    reader blocked on disk the whole run), "major_faults" and "read" MB
+    actually fetched from storage.
+    """
+    path = test_file_path(file_size)
+    if cold:
+        drop_page_cache(path)
+    mapped = MappedInput(path) if mode == "mmap" else None
+    chunks = iter_mapped_chunks(mapped, chunk_size) if mapped is not None else iter_chunks(path, chunk_size)
+
+    verify_times = []
+    io_wait_start, read_start, (_, major_start) = io_wait_seconds(), read_bytes(), page_faults()
+    try:
+        with RssSampler(SWEEP_RSS_INTERVAL) as sampler:
+            start = time.perf_counter()
+            encryption_time, decryption_time = measure_stream(cipher, chunks, key_size, verify_times)
+            elapsed = time.perf_counter() - start
+    finally:
+        if mapped is not None:
+            mapped.close()
+
+    return {
+        "encrypt": file_size / encryption_time,
+        "decrypt": file_size / decryption_time,
+        "wall": file_size / (elapsed - sum(verify_times)),
+        "peak_rss": sampler.peak / (1024 * 1024),
+        "rss_growth": sampler.peak_delta / (1024 * 1024),
+        "io_wait": (io_wait_seconds() - io_wait_start) / elapsed,
+        "major_faults": page_faults()[1] - major_start,
+        "read": (read_bytes() - read_start) / (1024 * 1024),
+        "samples": [(encryption_time, decryption_time, sampler.peak)],
+    }
+
+
+def ensure_sweep_files(file_sizes, generate=False, seed=0):
+    """Return the file sizes whose test files exist, generating missing ones that fit on disk if asked."""
+    missing = [size for size in file_sizes if not os.path.exists(test_file_path(size))]
+    if missing and generate:
+        free = shutil.disk_usage(TEST_FILES_DIR).free
+        fitting = []
+        for size in missing:
+            if size * 1024 * 1024 < free:
+                fitting.append(size * 1024 * 1024)
+                free -= size * 1024 * 1024
+            else:
+                print(f"Not enough free disk space to generate {os.path.basename(test_file_path(size))}, skipping")
+        create_files(fitting, TEST_FILES_DIR, seed)
+    available = [size for size in file_sizes if os.path.exists(test_file_path(size))]
+    for size in sorted(set(file_sizes) - set(available)):
+        print(f"{os.path.basename(test_file_path(size))} not found, skipping "
+              f"(generate it with test_files/file_creator.py or pass --generate)")
+    return available
+
+
+def run_sweep(cipher_names, file_sizes=SWEEP_SIZES, modes=SWEEP_MODES, key_size=32, chunk_size=DEFAULT_CHUNK_SIZE,
+              iterations=1, cold=False, verbose=True):
+    """Measure every (cipher, mode, file size) with measure_large_file(), iterations passes each.
+
+    Returns {mode: {(cipher name, key size): {"runs": [[per-run dicts] per
+    file size], "samples": [[(enc s, dec s, peak RSS)] per file size]}}},
+    the "samples" layout result_rows() stores.
+    """
+    memory = psutil.virtual_memory().total / (1024 * 1024)
+    if verbose:
+        print(f"RAM: {memory / 1024:.1f} GB")
+    results = {}
+    for mode in modes:
+        for name in cipher_names:
+            cipher = get_cipher(name)
+            cipher_key_size = key_size if key_size in cipher.key_sizes else max(cipher.key_sizes)
+            label = cipher.row_label(cipher_key_size, "Encryption")
+            cell = results.setdefault(mode, {})[(name, cipher_key_size)] = {"runs": [], "samples": []}
+            for file_size in file_sizes:
+                runs = [measure_large_file(cipher, cipher_key_size, file_size, mode, chunk_size, cold)
+                        for i in range(iterations)]
+                cell["runs"].append(runs)
+                cell["samples"].append([sample for run in runs for sample in run["samples"]])
+                if verbose:
+                    for run in runs:
+                        print(f"File: {os.path.basename(test_file_path(file_size))} ({mode}"
+                              f"{', exceeds RAM' if file_size > memory else ''}), {label}: "
+                              f"Encryption {run['encrypt']:.2f} MB/s, Decryption {run['decrypt']:.2f} MB/s, "
+                              f"End-to-End {run['wall']:.2f} MB/s, Peak RSS {run['peak_rss']:.1f} MB "
+                              f"(+{run['rss_growth']:.1f}), I/O Wait {run['io_wait']:.1%}, "
+                              f"Major Faults {run['major_faults']}, Read {run['read']:.0f} MB")
+    return results
+
+
+def save_sweep(results, file_sizes=SWEEP_SIZES, output=None):
+    output = output or os.path.join(DATAFRAMES_DIR, 'throughput', 'large_file_sweep.csv')
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    rows = [["Method", "Mode", "File Size (MB)", "Encryption (MB/s)", "Decryption (MB/s)", "End-to-End (MB/s)",
+             "Peak RSS (MB)", "RSS Growth (MB)", "I/O Wait", "Major Faults", "Read (MB)"]]
+    for mode, cells in results.items():
+        for (name, key_size), cell in cells.items():
+            label = get_cipher(name).row_label(key_size, "Encryption")
+            for file_size, runs in zip(file_sizes, cell["runs"]):
+                for run in runs:
+                    rows.append([label, mode, file_size]
+                                + [run[field] for field in ("encrypt", "decrypt", "wall", "peak_rss", "rss_growth",
+                                                            "io_wait", "major_faults", "read")])
+    save_to_csv(output, rows)
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+
+from benchmark.stats import bootstrap_ci, mad_outliers, percentile, relative_standard_error
+
+
+@dataclass(frozen=True)
+class TimingConfig:
+    """How many times the harness calls a measure function.
+
+    After warmup discarded calls, it keeps sampling until every metric's
+    relative standard error is at most target_rse, but always takes at least
+    min_iterations and at most max_iterations samples. A target_rse of 0 runs
+    exactly max_iterations. Iterations in which any metric's modified z-score
+    exceeds outlier_threshold (e.g. a descheduled run) are dropped before the
+    RSE and every summary; 0 keeps them all.
+    """
+    warmup: int = 1
+    min_iterations: int = 5
+    max_iterations: int = 100
+    target_rse: float = 0.01
+    outlier_threshold: float = 3.5
+
+    @classmethod
+    def fixed(cls, iterations, warmup=0):
+        """Exactly iterations samples, none rejected, for callers that rely on the count."""
+        return cls(warmup=warmup, min_iterations=iterations, max_iterations=iterations, target_rse=0,
+                   outlier_threshold=0)
+
+
+DEFAULT_TIMING = TimingConfig()
+
+
+def kept_iterations(samples, threshold):
+    """Indices of the iterations in which no metric is an outlier at threshold (0 keeps every iteration)."""
+    outliers = [mad_outliers(metric, threshold) for metric in samples] if threshold > 0 else []
+    return [index for index in range(len(samples[0])) if not any(flags[index] for flags in outliers)]
+
+
+def collect_iterations(measure, timing=DEFAULT_TIMING):
+    """Like collect(), also returning the indices of the timed iterations kept after outlier rejection."""
+    for iteration in range(timing.warmup):
+        measure()
+
+    samples = None
+    kept = []
+    for iteration in range(timing.max_iterations):
+        durations = measure()
+        if samples is None:
+            samples = [[] for duration in durations]
+        for metric, duration in zip(samples, durations):
+            metric.append(duration)
+
+        kept = kept_iterations(samples, timing.outlier_threshold)
+        if (iteration + 1 >= timing.min_iterations and timing.target_rse > 0
+                and all(relative_standard_error([metric[index] for index in kept]) <= timing.target_rse
+                        for metric in samples)):
+            break
+    return [[metric[index] for index in kept] for metric in samples or []], kept
+
+
+def collect(measure, timing=DEFAULT_TIMING):
+    """Call measure() until the timing config is satisfied.
+
+    measure returns a tuple of durations in seconds (e.g. encryption and
+    decryption time). Returns one list of samples per tuple position, outlier
+    iterations removed.
+    """
+    return collect_iterations(measure, timing)[0]
+
+
+def summarize(durations, megabytes):
+    """Summarize per-iteration durations of processing megabytes each.
+
+    Throughput is total bytes over total time, not a mean of per-iteration
+    rates, so it is not skewed by fast outliers. Returns a dict with
+    "throughput" (MB/s) and its bootstrap "ci_low"/"ci_high", the "median",
+    "p95" and "p99" durations in ms, and the number of "iterations". Outliers
+    are rejected by collect(), so durations should come from there.
+    """
+    def throughput(sample):
+        return megabytes * len(sample) / sum(sample)
+
+    ci_low, ci_high = bootstrap_ci(durations, throughput)
+    return {
+        "throughput": throughput(durations),
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        "median": percentile(durations, 50) * 1000,
+        "p95": percentile(durations, 95) * 1000,
+        "p99": percentile(durations, 99) * 1000,
+        "iterations": len(durations),
+    }
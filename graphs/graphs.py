@@ -1,8 +1,49 @@
-import os
-
 import pandas as pd
 import matplotlib.pyplot as plt
 
+RESULTS_DIR = "../dataframes/results"  # Written by python -m benchmark throughput
+# Read only columns present in every part file, older ones predate the host fingerprint columns
+COLUMNS = ["run_id", "algorithm", "method", "mode", "key_bits", "bytes", "enc_ns", "dec_ns"]
+
+
+def load_samples(mode="read"):
+    """Per-iteration samples from the most recent run of each algorithm in the results store."""
+    df = pd.read_parquet(RESULTS_DIR, filters=[("mode", "==", mode)], columns=COLUMNS)
+    latest_runs = df.groupby("algorithm")["run_id"].max()
+    return df[df["run_id"] == df["algorithm"].map(latest_runs)]
+
+
+def wide_table(samples, algorithms, operation, value):
+    """Pivot samples into one row per method and one column per file size.
+
+    value is "time" (median seconds) or "throughput" (total MB over total seconds).
+    """
+    column = f"{operation}_ns"
+    samples = samples[samples["algorithm"].isin(algorithms)]
+    grouped = samples.groupby(["algorithm", "key_bits", "method", "bytes"])
+    if value == "time":
+        cells = grouped[column].median() / 1e9
+    else:
+        cells = grouped["bytes"].sum() / (1024 * 1024) / (grouped[column].sum() / 1e9)
+
+    table = cells.unstack("bytes")
+    table = table.reindex(algorithms, level="algorithm")
+    table.columns = [f"{size // (1024 * 1024)}MB" for size in table.columns]
+    table = table.reset_index(["algorithm", "key_bits"], drop=True).reset_index()
+    return table.rename(columns={"method": "Method"})
+
+
+def fastest_per_algorithm(table, fastest):
+    """Keep each algorithm's best key size: fastest is "min" for times, "max" for throughput."""
+    algorithm = table["Method"].map(samples_algorithm)
+    mean = table.iloc[:, 1:].mean(axis=1)
+    best = mean.groupby(algorithm).transform(fastest)
+    return table[mean == best]
+
+
+def file_sizes_mb(df):
+    return [int(column[:-2]) for column in df.columns[1:]]
+
 
 def plot_times(df, figure_name):
 
@@ -11,16 +52,16 @@ def plot_times(df, figure_name):
     else:
         mode = "Decryption"
 
-    x = [1, 10, 100, 1000]  # File sizes in MB
+    x = file_sizes_mb(df)  # File sizes in MB
     plt.figure(figsize=(10, 6))
 
     for index, row in df.iterrows():
-        plt.plot(x, row[1:], label=row[0], marker='o')  # Plot each row, skipping the first column
+        plt.plot(x, row.iloc[1:], label=row.iloc[0], marker='o')  # Plot each row, skipping the first column
 
     # Customize the plot
     plt.title(f"{mode} Time vs File Size", fontsize=14)
     plt.xlabel("File Size (MB)", fontsize=12)
-    plt.ylabel("Encryption Time (seconds)", fontsize=12)
+    plt.ylabel(f"{mode} Time (seconds)", fontsize=12)
     plt.xscale('log')  # Optional: Use a log scale for file sizes if appropriate
     plt.legend(title="Encryption Techniques", fontsize=10)
     plt.grid(True, which='both', linestyle='--', linewidth=0.5)
@@ -33,11 +74,11 @@ def plot_times(df, figure_name):
 
 
 def plot_throughput(df, figure_name):
-    x = [1, 10, 100, 1000]  # File sizes in MB
+    x = file_sizes_mb(df)  # File sizes in MB
     plt.figure(figsize=(10, 6))
 
     for index, row in df.iterrows():
-        plt.plot(x, row[1:], label=row[0], marker='o')  # Plot each row, skipping the first column
+        plt.plot(x, row.iloc[1:], label=row.iloc[0], marker='o')  # Plot each row, skipping the first column
 
     # Customize the plot
     plt.title("Throughput vs File Size", fontsize=14)
@@ -54,38 +95,48 @@ def plot_throughput(df, figure_name):
     plt.show()
 
 
-# Encrypt / Decrypt Data
-aes_encrypt_df = pd.read_csv("../dataframes/encryption/aes_encryption_times.csv")
-aes_decrypt_df = pd.read_csv("../dataframes/decryption/aes_decryption_times.csv")
-stream_ciphers_encrypt_df = pd.read_csv("../dataframes/encryption/stream_cipher_encryption_times.csv")
-stream_ciphers_decrypt_df = pd.read_csv("../dataframes/decryption/stream_cipher_decryption_times.csv")
-ecc_encrypt_df = pd.read_csv("../dataframes/encryption/ecc_encryption_times.csv")
-ecc_decrypt_df = pd.read_csv("../dataframes/decryption/ecc_decryption_times.csv")
-
-# Throughput Data
-aes_encrypt_throughput_df = pd.read_csv("../dataframes/throughput/aes_encryption_throughputs.csv")
-aes_decrypt_throughput_df = pd.read_csv("../dataframes/throughput/aes_encryption_throughputs.csv")
-stream_cipher_encrypt_throughput_df = pd.read_csv("../dataframes/throughput/stream_cipher_encryption_throughputs.csv")
-stream_cipher_decrypt_throughput_df = pd.read_csv("../dataframes/throughput/stream_cipher_decryption_throughputs.csv")
-ecc_encrypt_throughput_df = pd.read_csv("../dataframes/throughput/ecc_encryption_throughputs.csv")
-ecc_decrypt_throughput_df = pd.read_csv("../dataframes/throughput/ecc_decryption_throughputs.csv")
+samples = load_samples()
+samples_algorithm = samples.drop_duplicates("method").set_index("method")["algorithm"]
 
+AES_ECC = ["aes-cbc", "aes-ecb", "ecc"]
+STREAM_CIPHERS = ["rc4", "chacha20"]
+AEAD = ["aes-ctr", "aes-gcm", "aes-ocb", "chacha20-poly1305", "xchacha20-poly1305"]
 
 # Plot AES and ECC
-combined_encrypt_df = pd.concat([aes_encrypt_df, ecc_encrypt_df], axis=0)
-combined_decrypt_df = pd.concat([aes_decrypt_df, ecc_decrypt_df], axis=0)
-combined_throughput_df = pd.concat([aes_encrypt_throughput_df, ecc_encrypt_throughput_df], axis=0)
+combined_encrypt_df = wide_table(samples, AES_ECC, "enc", "time")
+combined_decrypt_df = wide_table(samples, AES_ECC, "dec", "time")
+combined_throughput_df = wide_table(samples, AES_ECC, "enc", "throughput")
 plot_times(combined_encrypt_df, "encrypt_times_aes")
 plot_times(combined_decrypt_df, "decrypt_times_aes")
 plot_throughput(combined_throughput_df, "throughput_aes_ecc")
 
 # Plot Stream Ciphers
+stream_ciphers_encrypt_df = wide_table(samples, STREAM_CIPHERS, "enc", "time")
+stream_ciphers_decrypt_df = wide_table(samples, STREAM_CIPHERS, "dec", "time")
+stream_cipher_encrypt_throughput_df = wide_table(samples, STREAM_CIPHERS, "enc", "throughput")
 plot_times(stream_ciphers_encrypt_df, "encrypt_times_stream_ciphers")
 plot_times(stream_ciphers_decrypt_df, "decrypt_times_stream_ciphers")
 plot_throughput(stream_cipher_encrypt_throughput_df, "throughput_stream_ciphers")
 
-# Plot Fastest AES, ECC, and Stream Cipher
-top_encrypt_df = pd.concat([combined_encrypt_df.iloc[[0, 4, 8]], stream_ciphers_encrypt_df.iloc[[1, 3]]], axis=0)
-top_throughput_df = pd.concat([combined_throughput_df.iloc[[1, 5, 6]], stream_cipher_encrypt_throughput_df.iloc[[3]]], axis=0)
+# Plot CTR and AEAD modes (throughput includes tag generation and verification)
+aead_encrypt_df = wide_table(samples, AEAD, "enc", "time")
+aead_decrypt_df = wide_table(samples, AEAD, "dec", "time")
+aead_throughput_df = wide_table(samples, AEAD, "enc", "throughput")
+if not aead_throughput_df.empty:
+    plot_times(aead_encrypt_df, "encrypt_times_aead")
+    plot_times(aead_decrypt_df, "decrypt_times_aead")
+    plot_throughput(aead_throughput_df, "throughput_aead")
+
+# Plot PyCryptodome against cryptography (OpenSSL) for every primitive run under both
+OPENSSL = sorted(algorithm for algorithm in samples["algorithm"].unique() if algorithm.endswith("@cryptography"))
+BACKEND_PAIRS = [name for algorithm in OPENSSL for name in (algorithm.split("@")[0], algorithm)]
+if OPENSSL:
+    plot_throughput(wide_table(samples, BACKEND_PAIRS, "enc", "throughput"), "throughput_backends")
+
+# Plot Fastest AES, ECC, Stream Cipher and AEAD
+top_encrypt_df = fastest_per_algorithm(pd.concat([combined_encrypt_df, stream_ciphers_encrypt_df, aead_encrypt_df]),
+                                       "min")
+top_throughput_df = fastest_per_algorithm(
+    pd.concat([combined_throughput_df, stream_cipher_encrypt_throughput_df, aead_throughput_df]), "max")
 plot_times(top_encrypt_df, "top_encrypt_times_each_mode")
 plot_throughput(top_throughput_df, "top_throughputs_each_mode")
@@ -36,8 +36,9 @@ def aes_decrypt_cbc(data, key, iv):
 
 
 # AES Encryption using the derived ECC shared key
-def ecc_encrypt(data, private_key, peer_public_key):
-    shared_key = derive_shared_key(private_key, peer_public_key)
+def ecc_encrypt(data, private_key, peer_public_key, shared_key=None):
+    if shared_key is None:
+        shared_key = derive_shared_key(private_key, peer_public_key)
     iv = os.urandom(16)  # Generate a random IV for AES
     padding_length = 16 - (len(data) % 16)
     padded_data = data + bytes([padding_length] * padding_length)  # Pad data
@@ -46,34 +47,40 @@ def ecc_encrypt(data, private_key, peer_public_key):
 
 
 # AES Decryption using the derived ECC shared key
-def ecc_decrypt(encrypted_data, private_key, peer_public_key, iv):
-    shared_key = derive_shared_key(private_key, peer_public_key)
+def ecc_decrypt(encrypted_data, private_key, peer_public_key, iv, shared_key=None):
+    if shared_key is None:
+        shared_key = derive_shared_key(private_key, peer_public_key)
     decrypted_data = aes_decrypt_cbc(encrypted_data, shared_key, iv)
     padding_length = decrypted_data[-1]
     unpadded_data = decrypted_data[:-padding_length]  # Remove padding
     return unpadded_data
 
 
-# Measure encryption and decryption time
+# Measure key agreement, encryption and decryption time separately
 def measure_speed_ecc(data):
 
-    # Measure encryption time
-    start = time.time()
+    # Measure handshake time
+    start = time.perf_counter()
 
     # Generate ECC key pair for testing
     private_key = generate_ecc_key(ec.SECP256R1())
     peer_private_key = generate_ecc_key(ec.SECP256R1())
     peer_public_key = peer_private_key.public_key()
+    shared_key = derive_shared_key(private_key, peer_public_key)
+    handshake_time = time.perf_counter() - start
 
-    encrypted_data, iv = ecc_encrypt(data, private_key, peer_public_key)
-    encryption_time = time.time() - start
+    # Measure encryption time (bulk AES-CBC only, reusing the derived key)
+    start = time.perf_counter()
+    encrypted_data, iv = ecc_encrypt(data, private_key, peer_public_key, shared_key)
+    encryption_time = time.perf_counter() - start
 
     # Measure decryption time
-    start = time.time()
-    ecc_decrypt(encrypted_data, private_key, peer_public_key, iv)
-    decryption_time = time.time() - start
+    start = time.perf_counter()
+    decrypted_data = ecc_decrypt(encrypted_data, private_key, peer_public_key, iv, shared_key)
+    decryption_time = time.perf_counter() - start
 
-    return encryption_time, decryption_time
+    assert decrypted_data == data, "Decrypted data does not match original!"
+    return handshake_time, encryption_time, decryption_time
 
 
 def save_to_csv(file_name, data):
@@ -88,6 +95,7 @@ def test_file_sizes():
     file_sizes = [1, 10, 100, 1000]  # File sizes in MB
     ecc_encrypt_times = {16: [], 24: [], 32: []}
     ecc_decrypt_times = {16: [], 24: [], 32: []}
+    ecc_handshake_times = {16: [], 24: [], 32: []}
 
     for file_size in file_sizes:
         for key_size in ecc_encrypt_times.keys():
@@ -97,23 +105,27 @@ def test_file_sizes():
             with open(filename, 'rb') as f:
                 data = f.read()
 
-            ecc_encryption_time, ecc_decryption_time = measure_speed_ecc(data)
+            ecc_handshake_time, ecc_encryption_time, ecc_decryption_time = measure_speed_ecc(data)
 
             # Accumulate total times
+            ecc_handshake_times[key_size].append(ecc_handshake_time)
             ecc_encrypt_times[key_size].append(ecc_encryption_time)
             ecc_decrypt_times[key_size].append(ecc_decryption_time)
 
     # Prepare data for CSV
     encrypt_time_data = [["Method"] + [f"{size}MB" for size in file_sizes]]
     decrypt_time_data = [["Method"] + [f"{size}MB" for size in file_sizes]]
+    handshake_time_data = [["Method"] + [f"{size}MB" for size in file_sizes]]
 
     for key_size in ecc_encrypt_times.keys():
         encrypt_time_data.append([f"CBC-{key_size * 8} with ECC"] + ecc_encrypt_times[key_size])
         decrypt_time_data.append([f"CBC-{key_size * 8} with ECC"] + ecc_decrypt_times[key_size])
+        handshake_time_data.append([f"CBC-{key_size * 8} with ECC"] + ecc_handshake_times[key_size])
 
     # Save throughput results to CSV
     save_to_csv('../dataframes/encryption/ecc_encryption_times.csv', encrypt_time_data)
     save_to_csv('../dataframes/decryption/ecc_decryption_times.csv', decrypt_time_data)
+    save_to_csv('../dataframes/encryption/ecc_handshake_times.csv', handshake_time_data)
 
 
 test_file_sizes()
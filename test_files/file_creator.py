@@ -1,13 +1,170 @@
+import argparse
+import hashlib
+import json
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 
-# Create files of specific sizes in MB
-def create_file(filename, size_mb):
-    with open(filename, 'wb') as f:
-        f.write(os.urandom(size_mb * 1024 * 1024))
+UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+DEFAULT_SIZES = ["1MB", "10MB", "100MB", "1000MB"]
+CHUNK_SIZE = 64 * 1024 * 1024  # Bytes generated and written per task
+BLOCK_SIZE = 1024 * 1024  # Bytes per independently seeded PRNG stream
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+MANIFEST = "manifest.json"
 
 
-create_file("test_1MB.txt", 1)
-create_file("test_10MB.txt", 10)
-create_file("test_100MB.txt", 100)
-create_file("test_1000MB.txt", 1000)
+def parse_size(text):
+    """Parse "4KB", "16GB" or a plain byte count into bytes."""
+    match = re.fullmatch(r"(\d+)\s*([KMGT]?B)?", text.strip().upper())
+    if match is None:
+        raise argparse.ArgumentTypeError(f"Invalid size {text!r}, expected e.g. 4KB, 100MB or 16GB")
+    return int(match.group(1)) * UNITS[match.group(2) or "B"]
+
+
+def size_label(size):
+    """Largest unit that divides size exactly, so 1 MiB is "1MB" and 1000 MiB stays "1000MB"."""
+    for unit, factor in reversed(UNITS.items()):
+        if size % factor == 0:
+            return f"{size // factor}{unit}"
+
+
+def power_of_two_ladder(smallest, largest):
+    sizes = []
+    size = 1 << (smallest - 1).bit_length()  # Round up to a power of two
+    while size <= largest:
+        sizes.append(size)
+        size *= 2
+    return sizes
+
+
+def file_name(size):
+    return f"test_{size_label(size)}.txt"
+
+
+# Fill one chunk of a file with PRNG output
+def write_chunk(path, offset, length, seed, size):
+    # Every BLOCK_SIZE block has its own stream derived from (seed, file size, block index),
+    # so contents do not depend on the chunk size, the number of workers or scheduling
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        for block_offset in range(offset, offset + length, BLOCK_SIZE):
+            block = np.random.SeedSequence([seed, size, block_offset // BLOCK_SIZE])
+            generator = np.random.Generator(np.random.PCG64(block))
+            f.write(generator.bytes(min(BLOCK_SIZE, offset + length - block_offset)))
+
+
+def preallocate(path, size):
+    with open(path, 'wb') as f:
+        if hasattr(os, 'posix_fallocate') and size:
+            os.posix_fallocate(f.fileno(), 0, size)
+        else:
+            f.truncate(size)
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(directory, manifest):
+    with open(os.path.join(directory, MANIFEST), 'w') as f:
+        json.dump(dict(sorted(manifest.items(), key=lambda item: item[1]["bytes"])), f, indent=2)
+
+
+def is_current(directory, name, entry, size, seed):
+    """True if the file exists with the size and seed the manifest says it was generated with."""
+    path = os.path.join(directory, name)
+    return (entry is not None and entry["bytes"] == size and entry["seed"] == seed
+            and os.path.exists(path) and os.path.getsize(path) == size)
+
+
+def create_files(sizes, directory, seed=0, workers=None, chunk_size=CHUNK_SIZE, force=False):
+    """Generate one file per size, chunks spread across a process pool, and update the manifest.
+
+    Files already listed in the manifest with the same size and seed are
+    skipped unless force is set. Memory use is bounded by workers * chunk_size.
+    """
+    chunk_size = max(BLOCK_SIZE, chunk_size - chunk_size % BLOCK_SIZE)  # Chunks must start on a block boundary
+    manifest = load_manifest(directory)
+    pending = [size for size in sizes
+               if force or not is_current(directory, file_name(size), manifest.get(file_name(size)), size, seed)]
+
+    with ProcessPoolExecutor(workers) as pool:
+        chunk_futures = {}
+        for size in pending:
+            path = os.path.join(directory, file_name(size))
+            preallocate(path, size)
+            chunk_futures[size] = [pool.submit(write_chunk, path, offset, min(chunk_size, size - offset), seed, size)
+                                   for offset in range(0, size, chunk_size)]
+
+        # Hash each file in the pool as soon as all of its chunks are written
+        hash_futures = {}
+        for size, futures in chunk_futures.items():
+            for future in futures:
+                future.result()
+            hash_futures[size] = pool.submit(sha256_file, os.path.join(directory, file_name(size)))
+
+        for size, future in hash_futures.items():
+            manifest[file_name(size)] = {"bytes": size, "seed": seed, "sha256": future.result()}
+            print(f"Created {file_name(size)}")
+
+    for size in sorted(set(sizes) - set(pending)):
+        print(f"Skipped {file_name(size)}, already current")
+
+    save_manifest(directory, manifest)
+    return manifest
+
+
+def verify_files(directory):
+    """Recompute every checksum in the manifest; returns the names that do not match."""
+    mismatched = []
+    for name, entry in load_manifest(directory).items():
+        path = os.path.join(directory, name)
+        if not os.path.exists(path) or sha256_file(path) != entry["sha256"]:
+            mismatched.append(name)
+            print(f"{name}: checksum mismatch or missing")
+        else:
+            print(f"{name}: OK")
+    return mismatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate reproducible random test files with a checksum manifest")
+    parser.add_argument("--sizes", nargs="+", type=parse_size,
+                        help=f"Explicit file sizes, e.g. 4KB 100MB 16GB (default: {' '.join(DEFAULT_SIZES)})")
+    parser.add_argument("--ladder", nargs=2, type=parse_size, metavar=("SMALLEST", "LARGEST"),
+                        help="Every power-of-two size from SMALLEST to LARGEST, e.g. --ladder 4KB 16GB")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="Generator processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=parse_size, default=CHUNK_SIZE)
+    parser.add_argument("--output-dir", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--force", action="store_true", help="Regenerate files the manifest says are current")
+    parser.add_argument("--verify", action="store_true", help="Check existing files against the manifest and exit")
+    args = parser.parse_args()
+
+    if args.verify:
+        raise SystemExit(1 if verify_files(args.output_dir) else 0)
+
+    sizes = set(args.sizes or [])
+    if args.ladder:
+        sizes.update(power_of_two_ladder(*args.ladder))
+    if not sizes:
+        sizes = {parse_size(size) for size in DEFAULT_SIZES}
+    create_files(sorted(sizes), args.output_dir, args.seed, args.workers, args.chunk_size, args.force)
+
+
+if __name__ == "__main__":
+    main()